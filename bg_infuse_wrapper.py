@@ -157,4 +157,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=int(os.getenv("WRAPPER_PORT", "8090")),
         reload=True,
+        loop="uvloop",
+        http="httptools",
     )
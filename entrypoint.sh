@@ -3,5 +3,5 @@ set -euo pipefail
 
 PORT="${PORT:-8080}"
 
-exec /usr/local/bin/gunicorn -w 2 -k uvicorn.workers.UvicornWorker -b "0.0.0.0:${PORT}" --timeout 180 --graceful-timeout 30 --keep-alive 65 src.translator_app.main:app
+exec /usr/local/bin/gunicorn -w 2 -k src.translator_app.workers.UvloopWorker -b "0.0.0.0:${PORT}" --timeout 180 --graceful-timeout 30 --keep-alive 65 src.translator_app.main:app
 
@@ -3,4 +3,13 @@ import uvicorn
 from src.translator_app.main import app
 
 if __name__ == "__main__":
-    uvicorn.run("src.translator_app.main:app", host="0.0.0.0", port=8000, reload=True)
+    uvicorn.run(
+        "src.translator_app.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        loop="uvloop",
+        http="httptools",
+        access_log=False,
+        log_level="warning",
+    )
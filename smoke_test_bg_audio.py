@@ -3,10 +3,13 @@
 Real smoke test for BG Audio detection using local server.
 Tests actual stream requests with your upstream addon.
 """
+import asyncio
 import httpx
 import json
 import re
+import time
 from base64 import b64encode
+from itertools import product
 
 # Test with popular content that might have BG audio
 TEST_CASES = [
@@ -23,29 +26,54 @@ TEST_CASES = [
     ("series", "tt0944947:1:1", "Game of Thrones S01E01"),
 ]
 
+# Upstream/title requests in flight at once
+CONCURRENCY = 20
+
 # Common upstream addons to test
 UPSTREAM_ADDONS = [
     "https://torrentio.strem.fun",
     "https://mediafusion.elfhosted.com",
 ]
 
+BG_AUDIO_KEYWORDS = [
+    "bg audio", "bgaudio", "bg-audio",
+    "bg dub", "bgdub", "bg-dub",
+    "бг аудио", "бг дублаж",
+    "bulgarian audio", "bulgarian dub"
+]
+# A space in a keyword also matches a run of "._-" separators
+BG_AUDIO_RE = re.compile(
+    "|".join(re.escape(k).replace(r"\ ", r"(?: |[._\-]+)") for k in BG_AUDIO_KEYWORDS),
+    re.IGNORECASE,
+)
+
 def detect_bg_audio(stream_name):
     """Check for BG audio indicators (same logic as implementation)"""
-    text = stream_name.lower()
-    text = re.sub(r'[._\-]+', ' ', text)
-    
-    keywords = [
-        "bg audio", "bgaudio", "bg-audio",
-        "bg dub", "bgdub", "bg-dub",
-        "бг аудио", "бг дублаж",
-        "bulgarian audio", "bulgarian dub"
-    ]
-    
-    for kw in keywords:
-        if kw in text:
-            return True, kw
+    match = BG_AUDIO_RE.search(stream_name)
+    if match:
+        return True, match.group(0)
     return False, None
 
+async def gather_with_concurrency(n, *coros):
+    """Run coroutines concurrently, at most n at a time, keeping their order."""
+    semaphore = asyncio.Semaphore(n)
+
+    async def sem_coro(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(sem_coro(c) for c in coros))
+
+async def fetch_title(client, encoded_upstream, media_type, imdb_id):
+    """Request one title through the local server; returns (response or error, seconds)."""
+    url = f"http://localhost:8000/{encoded_upstream}/enrich=1/stream/{media_type}/{imdb_id}.json"
+    started = time.perf_counter()
+    try:
+        response = await client.get(url)
+    except Exception as e:
+        response = e
+    return response, time.perf_counter() - started
+
 async def test_local_server():
     """Test the local server with real requests"""
     print("=" * 80)
@@ -70,62 +98,71 @@ async def test_local_server():
             print("Please ensure the server is running: uvicorn main:app --port 8000")
             return
         
-        # Test each upstream addon
+        # Every upstream/title combination runs concurrently like real clients would
+        combos = list(product(UPSTREAM_ADDONS, TEST_CASES))
+        results = await gather_with_concurrency(
+            CONCURRENCY,
+            *[
+                fetch_title(client, b64encode(upstream.encode()).decode(), media_type, imdb_id)
+                for upstream, (media_type, imdb_id, _) in combos
+            ],
+        )
+        results_by_upstream = {}
+        for (upstream, case), result in zip(combos, results, strict=True):
+            results_by_upstream.setdefault(upstream, []).append((case, result))
+        
+        # Report per upstream addon
         for upstream in UPSTREAM_ADDONS:
             upstream_name = upstream.split("//")[1].split(".")[0]
             print(f"🔍 Testing with upstream: {upstream_name}")
             print("-" * 80)
             
-            # Encode upstream URL
-            encoded_upstream = b64encode(upstream.encode()).decode()
-            
-            for media_type, imdb_id, title in TEST_CASES:
-                print(f"\n  📺 {title} ({media_type}/{imdb_id})")
+            for (media_type, imdb_id, title), (response, elapsed) in results_by_upstream[upstream]:
+                print(f"\n  📺 {title} ({media_type}/{imdb_id}) [{elapsed:.2f}s]")
                 
-                # Make request through local server
-                url = f"http://localhost:8000/{encoded_upstream}/enrich=1/stream/{media_type}/{imdb_id}.json"
+                if isinstance(response, Exception):
+                    print(f"     ⚠️  Error: {str(response)[:60]}")
+                    continue
+                
+                if response.status_code != 200:
+                    print(f"     ⚠️  Response: {response.status_code}")
+                    continue
                 
                 try:
-                    response = await client.get(url)
-                    
-                    if response.status_code != 200:
-                        print(f"     ⚠️  Response: {response.status_code}")
-                        continue
-                    
                     data = response.json()
-                    streams = data.get("streams", [])
-                    total_streams += len(streams)
-                    
-                    print(f"     Found {len(streams)} streams")
+                except Exception as e:
+                    print(f"     ⚠️  Error: {str(e)[:60]}")
+                    continue
+                streams = data.get("streams", [])
+                total_streams += len(streams)
+                
+                print(f"     Found {len(streams)} streams")
+                
+                # Check for BG audio indicators
+                bg_in_this_title = 0
+                for stream in streams:
+                    name = stream.get("name", "")
+                    detected, keyword = detect_bg_audio(name)
                     
-                    # Check for BG audio indicators
-                    bg_in_this_title = 0
-                    for stream in streams:
-                        name = stream.get("name", "")
-                        detected, keyword = detect_bg_audio(name)
-                        
-                        # Also check for our visual tags
-                        has_audio_tag = "🔊" in name
-                        has_bg_tag = "🇧🇬" in name
-                        
-                        if detected or has_audio_tag:
-                            bg_audio_found += 1
-                            bg_in_this_title += 1
-                            bg_audio_samples.append({
-                                "title": title,
-                                "name": name,
-                                "keyword": keyword,
-                                "has_flag": has_audio_tag,
-                                "upstream": upstream_name
-                            })
+                    # Also check for our visual tags
+                    has_audio_tag = "🔊" in name
+                    has_bg_tag = "🇧🇬" in name
                     
-                    if bg_in_this_title > 0:
-                        print(f"     ✅ Found {bg_in_this_title} streams with BG audio!")
-                    else:
-                        print(f"     ❌ No BG audio detected")
+                    if detected or has_audio_tag:
+                        bg_audio_found += 1
+                        bg_in_this_title += 1
+                        bg_audio_samples.append({
+                            "title": title,
+                            "name": name,
+                            "keyword": keyword,
+                            "has_flag": has_audio_tag,
+                            "upstream": upstream_name
+                        })
                 
-                except Exception as e:
-                    print(f"     ⚠️  Error: {str(e)[:60]}")
+                if bg_in_this_title > 0:
+                    print(f"     ✅ Found {bg_in_this_title} streams with BG audio!")
+                else:
+                    print(f"     ❌ No BG audio detected")
             
             print()
     
@@ -170,5 +207,4 @@ async def test_local_server():
     print("=" * 80)
 
 if __name__ == "__main__":
-    import asyncio
     asyncio.run(test_local_server())
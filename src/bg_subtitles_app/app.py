@@ -5,18 +5,22 @@ import hashlib
 import logging
 import os
 import re
+import threading
 import time
 import uuid
-import json
 import unicodedata
 from typing import Dict, List, Optional, Set
 from urllib.parse import unquote, urlencode, quote
 
+import cachetools
+import orjson
 from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, Response, RedirectResponse
 
 from src.bg_subtitles_app.bg_subtitles.service import (
+    SERVED_STALE,
+    close_provider_client,
     resolve_subtitle,
     search_subtitles,
     search_subtitles_async,
@@ -45,8 +49,12 @@ charset_logger.propagate = False
 logging.getLogger("charset_normalizer.md__mypyc").setLevel(logging.WARNING)
 labels_logger = logging.getLogger("bg_subtitles.labels")
 
+_TRUTHY = frozenset({"1", "true", "yes"})
+# Player hints passed through to the search and onto subtitle URLs
+_FORWARD_KEYS = frozenset({"filename", "videoName", "name", "videoSize", "videoHash", "videoFps", "videoDuration", "videoDurationSec"})
+
 try:
-    _LABEL_DEBUG_ENABLED = ((os.getenv("BG_SUBS_DEBUG_LABELS") or "").strip().lower() in {"1", "true", "yes"})
+    _LABEL_DEBUG_ENABLED = ((os.getenv("BG_SUBS_DEBUG_LABELS") or "").strip().lower() in _TRUTHY)
 except Exception:
     _LABEL_DEBUG_ENABLED = False
 
@@ -55,12 +63,51 @@ os.environ.setdefault("BG_SUBS_SRT_CRLF", "1")
 
 _INFUSE_ALLOWED_PROVIDERS = set(INFUSE_PROVIDER_MAP.values())
 
-# Debug logging toggle for richer router/download diagnostics
-def _debug_enabled() -> bool:
+
+def _env_flag(name: str, default: str = "") -> bool:
     try:
-        return os.getenv("BG_SUBS_DEBUG_LOGS", "").lower() in {"1", "true", "yes"}
+        return os.getenv(name, default).lower() in _TRUTHY
     except Exception:
-        return False
+        return default.lower() in _TRUTHY
+
+
+# Deployment-level settings, read once at import instead of on every request
+_DEBUG_LOGS_ENABLED = _env_flag("BG_SUBS_DEBUG_LOGS")
+_FORCE_HTTPS = _env_flag("BG_SUBS_FORCE_HTTPS")
+_MOUNT_PREFIX = os.getenv("BG_SUBS_MOUNT_PREFIX", "/bg").rstrip("/")
+_GROUP_BY_FPS = _env_flag("BG_SUBS_GROUP_BY_FPS")
+_LABEL_IN_LANG = _env_flag("BG_SUBS_LABEL_IN_LANG")
+_SINGLE_GROUP = _env_flag("BG_SUBS_SINGLE_GROUP", "1")
+_VIDI_MODE = _env_flag("BG_SUBS_VIDI_MODE", "1")
+try:
+    _DEFAULT_VARIANTS = max(1, int(os.getenv("BG_SUBS_DEFAULT_VARIANTS", "5")))
+except Exception:
+    _DEFAULT_VARIANTS = 5
+
+
+def _env_positive_int(*names: str) -> Optional[int]:
+    """First of the named settings holding a positive integer, or None."""
+    for name in names:
+        try:
+            value = int(os.getenv(name, "0"))
+        except Exception:
+            continue
+        if value > 0:
+            return value
+    return None
+
+
+# Response shaping settings; BG_SUBS_JSON_SAFE_VARIANTS is the legacy name
+_SAFE_VARIANTS = _env_positive_int("BG_SUBS_SAFE_VARIANTS", "BG_SUBS_JSON_SAFE_VARIANTS")
+_DEFAULT_LIMIT = _env_positive_int("BG_SUBS_DEFAULT_LIMIT")
+_SINGLE_PER_PROVIDER = _env_flag("BG_SUBS_SINGLE_PER_PROVIDER", "1")
+_OMNI_MINIMAL = _env_flag("BG_SUBS_OMNI_MINIMAL")
+_OMNI_TOTAL_LIMIT = _env_positive_int("BG_SUBS_OMNI_TOTAL_LIMIT")
+_ARRAY_ON_PLAIN = _env_flag("BG_SUBS_ARRAY_ON_PLAIN")
+
+# Debug logging toggle for richer router/download diagnostics
+def _debug_enabled() -> bool:
+    return _DEBUG_LOGS_ENABLED
 
 
 def _clean_label(text: object) -> str:
@@ -88,7 +135,107 @@ def _should_force_bg_lang(default: bool) -> bool:
         raw = ""
     if not raw:
         return default
-    return raw.lower() in {"1", "true", "yes"}
+    return raw.lower() in _TRUTHY
+
+
+def _json_line(record: dict) -> str:
+    return orjson.dumps(record).decode("utf-8")
+
+
+# Log timestamps have one-second resolution, so the formatted string is reused within a second
+_log_ts_second = -1
+_log_ts = ""
+
+
+def _log_timestamp() -> str:
+    global _log_ts_second, _log_ts
+    now = int(time.time())
+    if now != _log_ts_second:
+        _log_ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+        _log_ts_second = now
+    return _log_ts
+
+
+# Router/download debug lines go through a bounded queue so stdout writes never block the loop
+_LOG_QUEUE_SIZE = 10_000
+_LOG_BATCH = 256
+_log_queue: Optional[asyncio.Queue] = None
+_log_queue_loop: Optional[asyncio.AbstractEventLoop] = None
+_log_task: Optional[asyncio.Task] = None
+_log_dropped = 0
+
+
+def _write_stdout(data: bytes) -> None:
+    while data:
+        written = os.write(1, data)
+        data = data[written:]
+
+
+def _dropped_log_line() -> Optional[bytes]:
+    """A record reporting lines dropped on a full queue since the last report, if any."""
+    global _log_dropped
+    if not _log_dropped:
+        return None
+    dropped, _log_dropped = _log_dropped, 0
+    return orjson.dumps({
+        "ts": _log_timestamp(),
+        "level": "WARNING",
+        "logger": "router",
+        "msg": "Dropped debug log lines",
+        "dropped": dropped,
+    }) + b"\n"
+
+
+async def _drain_log_queue(queue: asyncio.Queue) -> None:
+    while True:
+        lines = [await queue.get()]
+        while len(lines) < _LOG_BATCH and not queue.empty():
+            lines.append(queue.get_nowait())
+        dropped = _dropped_log_line()
+        if dropped:
+            lines.append(dropped)
+        try:
+            await asyncio.to_thread(_write_stdout, b"".join(lines))
+        except Exception:
+            pass
+
+
+async def _stop_log_queue() -> None:
+    """Stop the drainer and write out whatever is still queued."""
+    global _log_queue, _log_queue_loop, _log_task
+    queue, task, loop = _log_queue, _log_task, _log_queue_loop
+    _log_queue = _log_queue_loop = _log_task = None
+    if task is None or loop is not asyncio.get_running_loop():
+        return
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    lines = []
+    while not queue.empty():
+        lines.append(queue.get_nowait())
+    dropped = _dropped_log_line()
+    if dropped:
+        lines.append(dropped)
+    if lines:
+        _write_stdout(b"".join(lines))
+
+
+def _log_json(record: dict) -> None:
+    global _log_queue, _log_queue_loop, _log_task, _log_dropped
+    line = orjson.dumps(record) + b"\n"
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _write_stdout(line)
+        return
+    if _log_queue is None or _log_queue_loop is not loop:
+        _log_queue = asyncio.Queue(maxsize=_LOG_QUEUE_SIZE)
+        _log_queue_loop = loop
+        _log_task = loop.create_task(_drain_log_queue(_log_queue))
+    try:
+        _log_queue.put_nowait(line)
+    except asyncio.QueueFull:
+        # Drop rather than stall requests behind a slow stdout
+        _log_dropped += 1
 
 
 def _debug_labels_enabled() -> bool:
@@ -149,8 +296,8 @@ def _sanitize_payload(items: List[dict]) -> None:
                 cleaned = _clean_label(orig)
                 if _debug_labels_enabled() and orig != cleaned:
                     try:
-                        labels_logger.info(json.dumps({
-                            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                        labels_logger.info(_json_line({
+                            "ts": _log_timestamp(),
                             "level": "INFO",
                             "logger": "labels",
                             "msg": "sanitized",
@@ -167,6 +314,13 @@ def _sanitize_payload(items: List[dict]) -> None:
 # ---------------------------------------------------------------------
 app = FastAPI(title="Bulgarian Subtitles for Stremio")
 
+async def shutdown() -> None:
+    """Release background resources. Runs on this app's shutdown; a host app that mounts it must await it."""
+    await _stop_log_queue()
+    await close_provider_client()
+
+app.add_event_handler("shutdown", shutdown)
+
 @app.middleware("http")
 async def _head_passthrough(request: Request, call_next):
     response = await call_next(request)
@@ -184,6 +338,12 @@ app.add_middleware(
 
 # Ephemeral cache to coordinate iOS empty-first responses per title
 IOS_EMPTY_PROBE = TTLCache(default_ttl=300)
+# Download ETags per token; bounded, and locked because downloads are built in worker threads
+DOWNLOAD_ETAGS = cachetools.TTLCache(maxsize=10_000, ttl=3600)
+_DOWNLOAD_ETAGS_LOCK = threading.Lock()
+# Finished subtitle list bodies with their ETags, so repeat requests skip payload building.
+# Keys carry per-file player params, so the cache is bounded; only touched from the event loop.
+RESPONSE_CACHE = cachetools.TTLCache(maxsize=2048, ttl=600)
 
 
 @app.middleware("http")
@@ -255,32 +415,41 @@ STREMIO_MANIFEST = {
 
 def _stremio_only_enabled() -> bool:
     try:
-        return os.getenv("BG_SUBS_STREMIO_ONLY", "").lower() in {"1", "true", "yes"}
+        return os.getenv("BG_SUBS_STREMIO_ONLY", "").lower() in _TRUTHY
     except Exception:
         return False
 
-def _manifest_response() -> JSONResponse:
-    return JSONResponse(MANIFEST)
+# Constant bodies are serialized once and sent as-is
+MANIFEST_BODY = orjson.dumps(MANIFEST)
+STREMIO_MANIFEST_BODY = orjson.dumps(STREMIO_MANIFEST)
+INDEX_BODY = orjson.dumps({"status": "ok", "manifest": "/manifest.json", "name": MANIFEST.get("name")})
+HEALTHZ_BODY = orjson.dumps({"status": "ok", "version": MANIFEST.get("version")})
+
+def _json_body_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+def _manifest_response() -> Response:
+    return _json_body_response(MANIFEST_BODY)
 
 @app.get("/manifest.json")
-async def manifest() -> JSONResponse:
+async def manifest() -> Response:
     if _stremio_only_enabled():
-        return JSONResponse(STREMIO_MANIFEST)
+        return _json_body_response(STREMIO_MANIFEST_BODY)
     return _manifest_response()
 
 @app.get("/{addon_path}/manifest.json")
-async def manifest_prefixed(addon_path: str) -> JSONResponse:
+async def manifest_prefixed(addon_path: str) -> Response:
     if (addon_path or "").lower() == "stremio":
-        return JSONResponse(STREMIO_MANIFEST)
+        return _json_body_response(STREMIO_MANIFEST_BODY)
     return _manifest_response()
 
 @app.get("/stremio/manifest.json")
-async def stremio_manifest() -> JSONResponse:
-    return JSONResponse(STREMIO_MANIFEST)
+async def stremio_manifest() -> Response:
+    return _json_body_response(STREMIO_MANIFEST_BODY)
 
 @app.get("/")
-async def index() -> JSONResponse:
-    return JSONResponse({"status": "ok", "manifest": "/manifest.json", "name": MANIFEST.get("name")})
+async def index() -> Response:
+    return _json_body_response(INDEX_BODY)
 
 # ---------------------------------------------------------------------
 # Health and metrics
@@ -301,8 +470,8 @@ except Exception:
     DOWNLOAD_COUNT = None
 
 @app.get("/healthz")
-async def healthz() -> JSONResponse:
-    return JSONResponse({"status": "ok", "version": MANIFEST.get("version")})
+async def healthz() -> Response:
+    return _json_body_response(HEALTHZ_BODY)
 
 @app.get("/metrics")
 async def metrics() -> Response:
@@ -314,28 +483,21 @@ async def metrics() -> Response:
 # ---------------------------------------------------------------------
 # Subtitle search
 # ---------------------------------------------------------------------
-def _build_subtitle_url(request: Request, token: str, addon_path: Optional[str]) -> str:
+def _subtitle_url_prefix(request: Request, addon_path: Optional[str]) -> str:
+    """Everything before the token in a subtitle download URL; the same for a whole response."""
     base = str(request.base_url)
     xf_proto = request.headers.get("x-forwarded-proto") or request.headers.get("X-Forwarded-Proto")
-    force_https = os.getenv("BG_SUBS_FORCE_HTTPS", "").lower() in {"1", "true", "yes"}
-    if force_https or (xf_proto and xf_proto.lower() == "https"):
+    if _FORCE_HTTPS or (xf_proto and xf_proto.lower() == "https"):
         base = base.replace("http://", "https://")
     base = base.rstrip("/")
-    mount_prefix = os.getenv("BG_SUBS_MOUNT_PREFIX", "/bg").rstrip("/")
-    if mount_prefix:
-        base = f"{base}{mount_prefix}"
+    if _MOUNT_PREFIX:
+        base = f"{base}{_MOUNT_PREFIX}"
     if addon_path:
-        return f"{base}/{addon_path}/subtitle/{token}.srt"
-    return f"{base}/subtitle/{token}.srt"
-
-def _single_provider_enabled() -> bool:
-    try:
-        return os.getenv("BG_SUBS_SINGLE_PER_PROVIDER", "1").lower() in {"1", "true", "yes"}
-    except Exception:
-        return True
+        return f"{base}/{addon_path}/subtitle/"
+    return f"{base}/subtitle/"
 
 def _single_per_provider(results: List[Dict]) -> List[Dict]:
-    if not _single_provider_enabled():
+    if not _SINGLE_PER_PROVIDER:
         return results
     seen: Set[str] = set()
     filtered: List[Dict] = []
@@ -347,6 +509,86 @@ def _single_per_provider(results: List[Dict]) -> List[Dict]:
         filtered.append(entry)
     return filtered
 
+def _entries_to_payload(
+    results: List[Dict],
+    request: Request,
+    addon_path: Optional[str],
+    forward: Dict[str, str],
+    force_iso639_1: bool,
+) -> List[Dict]:
+    """Turn search results into Stremio subtitle entries."""
+    base_lang = LANG_ISO639_1 if force_iso639_1 else LANG_ISO639_2
+    url_prefix = _subtitle_url_prefix(request, addon_path)
+    url_suffix = ".srt?" + urlencode(forward) if forward else ".srt"
+    payload: List[Dict] = []
+    for entry in results:
+        subtitle_url = url_prefix + entry["token"] + url_suffix
+
+        fps = (entry.get("fps") or "").strip()
+        fps_label = f"{fps} fps" if fps and not fps.endswith("fps") else fps or ""
+        lang_name = entry.get("language") or LANGUAGE
+        if fps_label:
+            lang_name = f"{lang_name} • {fps_label}"
+
+        source_display = entry.get("source")
+        if _SINGLE_GROUP:
+            source_display = "Bulgarian Subtitles"
+        elif _GROUP_BY_FPS and fps_label:
+            source_display = f"{source_display} {fps_label}"
+
+        prov = PROVIDER_LABELS.get(entry.get("source"), str(entry.get("source") or "").replace("_", " ").title())
+        name_with_fps = f"[{prov}] {fps_label}" if fps_label else f"[{prov}]"
+
+        lang_value = base_lang
+        if _LABEL_IN_LANG:
+            lang_value = f"{LANGUAGE} • {fps_label} • {prov}" if fps_label else f"{LANGUAGE} • {prov}"
+
+        payload.append(
+            {
+                "id": entry["id"],
+                "lang": lang_value,
+                "langName": lang_name,
+                "url": subtitle_url,
+                "name": name_with_fps,
+                "title": name_with_fps,
+                "filename": entry.get("filename"),
+                "format": entry.get("format", DEFAULT_FORMAT),
+                "source": source_display,
+                "impaired": False,
+            }
+        )
+    return payload
+
+def _etag_body_response(request: Request, body: bytes, current_etag: str) -> Response:
+    """Send a JSON body with its ETag, or a 304 when the client already has it."""
+    headers = {
+        "Cache-Control": "public, max-age=60",
+        "ETag": current_etag,
+    }
+    inm = request.headers.get("if-none-match")
+    if inm and inm.strip() == current_etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _etag_json_response(request: Request, content: object, cache_key: Optional[tuple] = None) -> Response:
+    """Serialize with orjson, tagging the body so polling clients can revalidate with a 304."""
+    body = orjson.dumps(content)
+    current_etag = f'W/"{hashlib.md5(body).hexdigest()}"'
+    if cache_key is not None:
+        RESPONSE_CACHE[cache_key] = (body, current_etag)
+    return _etag_body_response(request, body, current_etag)
+
+def _response_cache_key(request: Request, *args: object) -> tuple:
+    """Everything the subtitle list body depends on besides the search results."""
+    xf_proto = (request.headers.get("x-forwarded-proto") or "").lower()
+    return (
+        str(request.url),
+        xf_proto == "https",
+        _is_ios_request(request),
+        _is_stremio_request(request),
+        *args,
+    )
+
 async def _build_subtitles_response(
     media_type: str,
     item_id: str,
@@ -358,8 +600,8 @@ async def _build_subtitles_response(
     strict_mode: bool = False,
     had_json_suffix: bool = False,
     extras: Optional[Dict[str, str]] = None,
-) -> JSONResponse:
-    start = time.time()
+) -> Response:
+    start = time.monotonic()
     
     if media_type not in {"movie", "series"}:
         raise HTTPException(status_code=404, detail="Unsupported media type")
@@ -370,31 +612,30 @@ async def _build_subtitles_response(
         except Exception:
             pass
 
-    default_variants = 5
-    try:
-        default_variants = max(1, int(os.getenv("BG_SUBS_DEFAULT_VARIANTS", str(default_variants))))
-    except Exception:
-        pass
+    cache_key = _response_cache_key(
+        request,
+        addon_path,
+        media_type,
+        item_id,
+        limit,
+        variants,
+        force_iso639_1,
+        strict_mode,
+        had_json_suffix,
+        tuple(sorted(extras.items())) if extras else (),
+    )
+    cached = RESPONSE_CACHE.get(cache_key)
+    if cached is not None:
+        if REQ_LATENCY:
+            try:
+                REQ_LATENCY.labels(route="subtitles").observe(time.monotonic() - start)
+            except Exception:
+                pass
+        return _etag_body_response(request, *cached)
 
-    safe_variants_env: Optional[int] = None
-    try:
-        v = int(os.getenv("BG_SUBS_SAFE_VARIANTS", "0"))
-        if v > 0:
-            safe_variants_env = v
-    except Exception:
-        pass
-    if safe_variants_env is None:
-        try:
-            legacy = int(os.getenv("BG_SUBS_JSON_SAFE_VARIANTS", "0"))
-            if legacy > 0:
-                safe_variants_env = legacy
-        except Exception:
-            pass
-    per_source = variants if variants and variants > 0 else (safe_variants_env or default_variants)
+    per_source = variants if variants and variants > 0 else (_SAFE_VARIANTS or _DEFAULT_VARIANTS)
 
-    forward_keys = {"filename", "videoName", "name", "videoSize", "videoHash", "videoFps", "videoDuration", "videoDurationSec"}
-    
-    forward = {k: v for k, v in request.query_params.items() if k in forward_keys and v}
+    forward = {k: v for k, v in request.query_params.items() if k in _FORWARD_KEYS and v}
     
     if not strict_mode:
         if "filename" not in forward and ("videoName" in forward or "name" in forward):
@@ -402,14 +643,14 @@ async def _build_subtitles_response(
     
     if extras:
         for k, v in extras.items():
-            if k in forward_keys and v and k not in forward:
+            if k in _FORWARD_KEYS and v and k not in forward:
                 forward[k] = v
         if "filename" not in forward and ("videoName" in extras or "name" in extras):
             forward["filename"] = extras.get("videoName") or extras.get("name")
 
     if _debug_enabled():
-        print(json.dumps({
-            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        _log_json({
+            "ts": _log_timestamp(),
             "level": "INFO",
             "logger": "router",
             "msg": "Search parameters",
@@ -418,89 +659,34 @@ async def _build_subtitles_response(
             "strict_mode": strict_mode,
             "forward": forward,
             "per_source": per_source
-        }))
+        })
 
     results = await _call_search_with_fallback(media_type, item_id, per_source, forward)
     results = _single_per_provider(results)
     
-    effective_limit = limit
-    if effective_limit is None:
-        try:
-            env_limit = int(os.getenv("BG_SUBS_DEFAULT_LIMIT", "0"))
-            if env_limit > 0:
-                effective_limit = env_limit
-        except Exception:
-            pass
-            
+    effective_limit = limit if limit is not None else _DEFAULT_LIMIT
     if effective_limit:
         results = results[:effective_limit]
 
-    group_by_fps = os.getenv("BG_SUBS_GROUP_BY_FPS", "").lower() in {"1", "true", "yes"}
-    label_in_lang = os.getenv("BG_SUBS_LABEL_IN_LANG", "").lower() in {"1", "true", "yes"}
-    single_group = os.getenv("BG_SUBS_SINGLE_GROUP", "1").lower() in {"1", "true", "yes"}
-
-    payload: List[Dict] = []
-    for entry in results:
-        subtitle_url = _build_subtitle_url(request, entry["token"], addon_path=addon_path)
-        if forward:
-            subtitle_url = f"{subtitle_url}?{urlencode(forward)}"
-
-        fps = (entry.get("fps") or "").strip()
-        fps_label = f"{fps} fps" if fps and not fps.endswith("fps") else fps or ""
-        lang_name = entry.get("language") or LANGUAGE
-        if fps_label:
-            lang_name = f"{lang_name} • {fps_label}"
-
-        source_display = entry.get("source")
-        if single_group:
-            source_display = "Bulgarian Subtitles"
-        elif group_by_fps and fps_label:
-            source_display = f"{source_display} {fps_label}"
-
-        prov = PROVIDER_LABELS.get(entry.get("source"), str(entry.get("source") or "").replace("_", " ").title())
-        name_with_fps = f"[{prov}] {fps_label}" if fps_label else f"[{prov}]"
-
-        lang_value = LANG_ISO639_1 if force_iso639_1 else LANG_ISO639_2
-        if label_in_lang:
-            prov2 = PROVIDER_LABELS.get(entry.get("source"), str(entry.get("source") or "").replace("_", " ").title())
-            lang_value = f"{LANGUAGE} • {fps_label} • {prov2}" if fps_label else f"{LANGUAGE} • {prov2}"
+    payload = _entries_to_payload(results, request, addon_path, forward, force_iso639_1)
 
-        payload.append(
-            {
-                "id": entry["id"],
-                "lang": lang_value,
-                "langName": lang_name,
-                "url": subtitle_url,
-                "name": name_with_fps,
-                "title": name_with_fps,
-                "filename": entry.get("filename"),
-                "format": entry.get("format", DEFAULT_FORMAT),
-                "source": source_display,
-                "impaired": False,
-            }
-        )
-
-    vidi_mode = os.getenv("BG_SUBS_VIDI_MODE", "1").lower() in {"1", "true", "yes"}
+    vidi_mode = _VIDI_MODE
     if vidi_mode:
+        # Same for every entry, so the request headers are inspected once per response
+        vidi_fields = {
+            "type": "subtitle",
+            "lang": LANG_ISO639_1 if force_iso639_1 or _is_stremio_request(request) else LANG_ISO639_2,
+            "langName": "Bulgarian",
+        }
         for s in payload:
-            s["type"] = "subtitle"
+            s.update(vidi_fields)
             s["label"] = s.get("title") or s.get("name") or "Bulgarian Subtitles"
-            prefer_bg = force_iso639_1 or _is_stremio_request(request)
-            s["lang"] = LANG_ISO639_1 if prefer_bg else LANG_ISO639_2
-            s["langName"] = "Bulgarian"
     _sanitize_payload(payload)
 
-    try:
-        omni_minimal = os.getenv("BG_SUBS_OMNI_MINIMAL", "").lower() in {"1", "true", "yes"}
-    except Exception:
-        omni_minimal = False
+    omni_minimal = _OMNI_MINIMAL
     if omni_minimal:
-        try:
-            omni_limit = int(os.getenv("BG_SUBS_OMNI_TOTAL_LIMIT", "0")) or 0
-        except Exception:
-            omni_limit = 0
-        if omni_limit > 0:
-            payload = payload[:omni_limit]
+        if _OMNI_TOTAL_LIMIT:
+            payload = payload[:_OMNI_TOTAL_LIMIT]
         minimal_items: List[dict] = []
         for s in payload:
             minimal_items.append({
@@ -520,56 +706,64 @@ async def _build_subtitles_response(
         ua = ""
     
     if _debug_enabled():
-        print(json.dumps({
-            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        _log_json({
+            "ts": _log_timestamp(),
             "level": "INFO",
             "logger": "router",
             "msg": "Response built" + (" (prefixed)" if addon_path else ""),
             "count": len(payload),
             "vidi_mode": vidi_mode,
-            "duration_ms": round((time.time() - start) * 1000),
+            "duration_ms": round((time.monotonic() - start) * 1000),
             "ua": ua[:120],
-            "shape": "array" if os.getenv("BG_SUBS_ARRAY_ON_PLAIN", "").lower() in {"1","true","yes"} else "object",
-        }))
+            "shape": "array" if _ARRAY_ON_PLAIN else "object",
+        })
 
     if REQ_LATENCY:
         try:
-            REQ_LATENCY.labels(route="subtitles").observe(time.time() - start)
+            REQ_LATENCY.labels(route="subtitles").observe(time.monotonic() - start)
         except Exception:
             pass
 
+    # Empty lists and bodies built from stale results are not kept, so a provider coming
+    # back or a finished refresh is picked up on the next request
+    if not payload or SERVED_STALE.get():
+        cache_key = None
+
     if had_json_suffix:
-        return JSONResponse({"subtitles": payload})
+        return _etag_json_response(request, {"subtitles": payload}, cache_key)
     
-    array_on_plain = os.getenv("BG_SUBS_ARRAY_ON_PLAIN", "").lower() in {"1", "true", "yes"}
-    if array_on_plain:
-        return JSONResponse(payload)
-    return JSONResponse({"subtitles": payload})
+    if _ARRAY_ON_PLAIN:
+        return _etag_json_response(request, payload, cache_key)
+    return _etag_json_response(request, {"subtitles": payload}, cache_key)
+
+def _is_stremio_prefix(addon_path: Optional[str]) -> bool:
+    return (addon_path or "").split("/", 1)[0].lower() == "stremio"
+
+async def _handle_json_route(media_type, item_id, request, addon_path, limit, is_stremio):
+    return await _build_subtitles_response(
+        media_type,
+        unquote(item_id),
+        request,
+        addon_path=addon_path,
+        limit=limit,
+        force_iso639_1=is_stremio,
+        strict_mode=is_stremio,
+        had_json_suffix=True,
+    )
 
 @app.get("/subtitles/{media_type}/{item_id}.json")
 async def subtitles(media_type: str, item_id: str, request: Request, limit: Optional[int] = Query(None)):
-    item_id = unquote(item_id)
     force_bg = _stremio_only_enabled() or _is_stremio_request(request)
-    return await _build_subtitles_response(
-        media_type, item_id, request, addon_path=None, limit=limit, force_iso639_1=force_bg, strict_mode=force_bg, had_json_suffix=True
-    )
+    return await _handle_json_route(media_type, item_id, request, None, limit, force_bg)
 
 @app.get("/{addon_path}/subtitles/{media_type}/{item_id}.json")
 async def subtitles_prefixed(addon_path: str, media_type: str, item_id: str, request: Request, limit: Optional[int] = Query(None)):
-    item_id = unquote(item_id)
-    is_stremio = (addon_path or "").lower() == "stremio"
-    return await _build_subtitles_response(
-        media_type, item_id, request, addon_path=addon_path, limit=limit, force_iso639_1=is_stremio, strict_mode=is_stremio, had_json_suffix=True
-    )
+    return await _handle_json_route(media_type, item_id, request, addon_path, limit, _is_stremio_prefix(addon_path))
 
 @app.get("/{addon_path}/{config}/subtitles/{media_type}/{item_id}.json")
 async def subtitles_prefixed_config(addon_path: str, config: str, media_type: str, item_id: str, request: Request, limit: Optional[int] = Query(None)):
-    item_id = unquote(item_id)
     full_prefix = f"{addon_path}/{config}"
-    is_stremio = (addon_path or "").lower() == "stremio" or full_prefix.split("/",1)[0].lower() == "stremio"
-    return await _build_subtitles_response(
-        media_type, item_id, request, addon_path=full_prefix, limit=limit, force_iso639_1=is_stremio, strict_mode=is_stremio, had_json_suffix=True
-    )
+    return await _handle_json_route(media_type, item_id, request, full_prefix, limit, _is_stremio_prefix(full_prefix))
 
 @app.get("/subtitles/{media_type}/{imdb_id:path}")
 async def subtitles_route(
@@ -611,15 +805,15 @@ async def _handle_path_route(media_type, imdb_id, request, addon_path, limit, va
     had_json_suffix = ".json" in raw_path
     extras_map: Dict[str, str] = {}
     extras_segment = ""
-    
+
+    # partition scans once and never builds the lists split() would
     if imdb_id.startswith("tt") and "/" in imdb_id:
-        imdb_base, extras_segment = imdb_id.split("/", 1)
-        imdb_id = imdb_base
+        imdb_id, _, extras_segment = imdb_id.partition("/")
     elif ".json" in imdb_id:
-        imdb_id = imdb_id.split(".json")[0]
+        imdb_id = imdb_id.partition(".json")[0]
     else:
-        imdb_id = imdb_id.split("?")[0].split("&")[0]
-        
+        imdb_id = imdb_id.partition("?")[0].partition("&")[0]
+
     if extras_segment:
         try:
             if extras_segment.endswith(".json"):
@@ -630,10 +824,7 @@ async def _handle_path_route(media_type, imdb_id, request, addon_path, limit, va
         except Exception:
             extras_map = {}
 
-    is_stremio = (addon_path or "").lower() == "stremio"
-    if addon_path and "/" in addon_path and addon_path.split("/", 1)[0].lower() == "stremio":
-        is_stremio = True
-
+    is_stremio = _is_stremio_prefix(addon_path)
     should_force_bg = is_stremio or _should_force_bg_lang(default=had_json_suffix)
 
     return await _build_subtitles_response(
@@ -807,7 +998,36 @@ async def serve_infuse_subtitle(
     if not token:
         raise HTTPException(status_code=502, detail="Subtitle token missing")
 
-    return _subtitle_download(request, str(token))
+    return await _download_response(request, str(token))
+
+
+async def _download_response(request: Request, token: str, head: bool = False) -> Response:
+    # resolve_subtitle downloads and extracts synchronously; keep it off the event loop
+    resp = await asyncio.to_thread(_subtitle_download, request, token)
+    # Log from the loop so download lines go through the bounded log queue
+    if _debug_enabled() and resp.status_code in (200, 206):
+        try:
+            _log_download(request, resp)
+        except Exception:
+            pass
+    if head:
+        resp.body = b""
+    return resp
+
+
+def _log_download(request: Request, resp: Response) -> None:
+    record = {
+        "ts": _log_timestamp(),
+        "level": "INFO",
+        "logger": "download",
+    }
+    if resp.status_code == 206:
+        span, _, total = resp.headers["content-range"].removeprefix("bytes ").partition("/")
+        record.update({"msg": "partial", "range": span, "total": int(total)})
+    else:
+        record.update({"msg": "full", "length": int(resp.headers["content-length"])})
+    record["ua"] = (request.headers.get("user-agent") or "")[:160]
+    _log_json(record)
 
 
 def _subtitle_download(request: Request, token: str) -> Response:
@@ -825,10 +1045,11 @@ def _subtitle_download(request: Request, token: str) -> Response:
     content: bytes = resolved["content"]
     # Optional line-ending normalization for SRT
     try:
-        crlf_flag = os.getenv("BG_SUBS_SRT_CRLF", "").lower() in {"1", "true", "yes"}
+        crlf_flag = os.getenv("BG_SUBS_SRT_CRLF", "").lower() in _TRUTHY
     except Exception:
         crlf_flag = False
-    if fmt == "srt" and (crlf_flag or is_ios):
+    normalize_crlf = fmt == "srt" and (crlf_flag or is_ios)
+    if normalize_crlf:
         try:
             text = content.decode("utf-8", errors="replace")
             text = text.replace("\r\n", "\n").replace("\r", "\n")
@@ -857,7 +1078,14 @@ def _subtitle_download(request: Request, token: str) -> Response:
         except Exception:
             return mt
 
-    etag = hashlib.md5(content).hexdigest()
+    # Content per token is fixed, so hash it once per token and line-ending variant
+    etag_key = f"{token}:{int(normalize_crlf)}"
+    with _DOWNLOAD_ETAGS_LOCK:
+        etag = DOWNLOAD_ETAGS.get(etag_key)
+    if etag is None:
+        etag = hashlib.md5(content).hexdigest()
+        with _DOWNLOAD_ETAGS_LOCK:
+            DOWNLOAD_ETAGS[etag_key] = etag
     current_etag = f'W/"{etag}"'
     inm = request.headers.get("if-none-match")
     headers = {
@@ -894,21 +1122,7 @@ def _subtitle_download(request: Request, token: str) -> Response:
             h = dict(headers)
             h["Content-Range"] = f"bytes {start}-{end}/{total}"
             h["Content-Length"] = str(len(chunk))
-            resp = Response(content=chunk, media_type=_with_charset(media_type, encoding), headers=h, status_code=206)
-            if _debug_enabled():
-                try:
-                    print(json.dumps({
-                        "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                        "level": "INFO",
-                        "logger": "download",
-                        "msg": "partial",
-                        "range": f"{start}-{end}",
-                        "total": total,
-                        "ua": (request.headers.get("user-agent") or "")[:160],
-                    }))
-                except Exception:
-                    pass
-            return resp
+            return Response(content=chunk, media_type=_with_charset(media_type, encoding), headers=h, status_code=206)
         except Exception:
             # Fall back to full response on parse errors
             pass
@@ -916,52 +1130,33 @@ def _subtitle_download(request: Request, token: str) -> Response:
     # Add length for clients that expect it on full responses
     headers["Content-Length"] = str(len(content))
 
-    resp = Response(content=content, media_type=_with_charset(media_type, encoding), headers=headers)
-    if _debug_enabled():
-        try:
-            print(json.dumps({
-                "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                "level": "INFO",
-                "logger": "download",
-                "msg": "full",
-                "length": len(content),
-                "ua": (request.headers.get("user-agent") or "")[:160],
-            }))
-        except Exception:
-            pass
-    return resp
+    return Response(content=content, media_type=_with_charset(media_type, encoding), headers=headers)
 
 
 @app.get("/subtitle/{token}.srt")
 async def serve_subtitle(request: Request, token: str) -> Response:
-    return _subtitle_download(request, token)
+    return await _download_response(request, token)
 
 
 @app.get("/{addon_path}/subtitle/{token}.srt")
 async def serve_subtitle_prefixed(request: Request, addon_path: str, token: str) -> Response:
-    return _subtitle_download(request, token)
+    return await _download_response(request, token)
 
 
 # Explicit HEAD handlers for subtitle downloads (some clients probe with HEAD)
 @app.head("/subtitle/{token}.srt")
 async def head_subtitle(request: Request, token: str) -> Response:
-    resp = _subtitle_download(request, token)
-    resp.body = b""
-    return resp
+    return await _download_response(request, token, head=True)
 
 @app.head("/{addon_path}/subtitle/{token}.srt")
 async def head_subtitle_prefixed(request: Request, addon_path: str, token: str) -> Response:
-    resp = _subtitle_download(request, token)
-    resp.body = b""
-    return resp
+    return await _download_response(request, token, head=True)
 
 # Compatibility: extra config segment before subtitle download
 @app.get("/{addon_path}/{config}/subtitle/{token}.srt")
 async def serve_subtitle_prefixed_config(request: Request, addon_path: str, config: str, token: str) -> Response:
-    return _subtitle_download(request, token)
+    return await _download_response(request, token)
 
 @app.head("/{addon_path}/{config}/subtitle/{token}.srt")
 async def head_subtitle_prefixed_config(request: Request, addon_path: str, config: str, token: str) -> Response:
-    resp = _subtitle_download(request, token)
-    resp.body = b""
-    return resp
+    return await _download_response(request, token, head=True)
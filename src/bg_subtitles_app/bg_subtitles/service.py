@@ -3,16 +3,17 @@ from __future__ import annotations
 import asyncio
 import base64
 import hashlib
+import cachetools
 import httpx
 import json
 import logging
 import re
 import binascii
+import contextvars
 from pathlib import Path
 import os
 import time
 import threading
-import uuid
 from typing import Dict, List, Optional, Tuple, Iterable, Set
 from collections import defaultdict
 
@@ -26,7 +27,7 @@ from .metadata import build_scraper_item, parse_stremio_id
 from .sources.nsub import get_sub
 from .sources import opensubtitles as opensubtitles_source
 from .sources import nsub as nsub_module
-from .sources.common import get_search_string, REQUEST_ID, _normalize_query
+from .sources.common import get_search_string, _normalize_query
 
 from .constants import (
     DEFAULT_FORMAT,
@@ -110,6 +111,10 @@ def _env_int(name: str, default: int | None) -> int | None:
 
 # Optional max size bounds to keep memory predictable in long‑running processes
 RESULT_CACHE = TTLCache(default_ttl=1800)
+# Last non-empty results, served while RESULT_CACHE has expired and a refresh runs. Bounded
+# (LRU within the TTL) and locked, since the sync search path runs its own loop in a worker thread
+STALE_RESULT_CACHE = cachetools.TTLCache(maxsize=1024, ttl=6 * 3600)
+_STALE_LOCK = threading.Lock()
 EMPTY_CACHE = TTLCache(default_ttl=300)
 RESOLVED_CACHE = TTLCache(default_ttl=300)
 TVDB_TOKEN_CACHE = TTLCache(default_ttl=3600)
@@ -118,6 +123,15 @@ TVDB_TOKEN_CACHE = TTLCache(default_ttl=3600)
 _INFLIGHT_LOCK = threading.Lock()
 _INFLIGHT_EVENTS: dict[str, threading.Event] = {}
 _PENDING_EMPTY_MARKS: Dict[str, asyncio.Task] = {}
+# Set when the current request's search was answered from STALE_RESULT_CACHE, so callers
+# can avoid keeping anything derived from it
+SERVED_STALE: contextvars.ContextVar[bool] = contextvars.ContextVar("served_stale", default=False)
+# One provider search per result key; concurrent misses and refreshes share it
+_SEARCH_TASKS: Dict[str, asyncio.Task] = {}
+# Process-wide provider client, built lazily on the serving loop
+_PROVIDER_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+_PROVIDER_CLIENT: Optional[httpx.AsyncClient] = None
+_PROVIDER_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
 
 DEFAULT_PROVIDER_TIMEOUT = float(getattr(nsub_module, "SOURCE_TIMEOUT", 12.0))
 VLAD_TIMEOUT = _env_float("BG_SUBS_TIMEOUT_VLAD00N", 4.0)
@@ -352,6 +366,30 @@ async def _schedule_empty_mark(key: str) -> None:
     _PENDING_EMPTY_MARKS[key] = task
 
 
+def _provider_client() -> httpx.AsyncClient:
+    """Return the client shared by provider searches on the running loop, so connections are kept alive."""
+    global _PROVIDER_CLIENT, _PROVIDER_CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _PROVIDER_CLIENT is None or _PROVIDER_CLIENT.is_closed or _PROVIDER_CLIENT_LOOP is not loop:
+        # A client from another loop cannot be reused; close it there if that loop still runs
+        old_client, old_loop = _PROVIDER_CLIENT, _PROVIDER_CLIENT_LOOP
+        if old_client is not None and not old_client.is_closed and old_loop is not None and old_loop.is_running():
+            asyncio.run_coroutine_threadsafe(old_client.aclose(), old_loop)
+        _PROVIDER_CLIENT = httpx.AsyncClient(timeout=None, limits=_PROVIDER_LIMITS)
+        _PROVIDER_CLIENT_LOOP = loop
+    return _PROVIDER_CLIENT
+
+
+async def close_provider_client() -> None:
+    """Close the shared provider client if it belongs to the running loop."""
+    global _PROVIDER_CLIENT, _PROVIDER_CLIENT_LOOP
+    client, loop = _PROVIDER_CLIENT, _PROVIDER_CLIENT_LOOP
+    if client is None or loop is not asyncio.get_running_loop():
+        return
+    _PROVIDER_CLIENT = _PROVIDER_CLIENT_LOOP = None
+    await client.aclose()
+
+
 def _provider_timeout(source_id: str) -> float:
     if source_id == "Vlad00nMooo":
         return max(0.1, VLAD_TIMEOUT)
@@ -387,49 +425,49 @@ async def fetch_all_providers_async(
     def _stat(source: str) -> Dict[str, int]:
         return provider_stats.setdefault(source, {"fetched": 0, "deduped": 0, "final": 0, "failed": 0, "retries": 0, "timeouts": 0})
 
-    async with httpx.AsyncClient(timeout=None) as client:
-        imdb_token = item.get("imdb_id") or item.get("id") or ""
-        fragment = item.get("normalized_fragment", "")
-        for source_id in sources:
-            module = nsub_module.SOURCE_REGISTRY[source_id]
-            query = nsub_module._normalise_for_source(source_id, item, search_str)
-            cache_key = nsub_module._provider_cache_key(source_id, query, search_year)
-            _stat(source_id)  # ensure entry exists
-            cached = nsub_module.PROVIDER_CACHE.get(cache_key)
-            if cached is not None:
-                count = len(cached or [])
-                _stat(source_id)["fetched"] += count
-                aggregated.extend(nsub_module._hydrate_results(source_id, cached))
-                continue
-            if nsub_module.FAILURE_CACHE.get(cache_key) is not None:
-                continue
-            timeout = _provider_timeout(source_id)
-            breaker_ttl = _provider_breaker_ttl(source_id)
-            pending_tasks.append(
-                _run_provider_task(
-                    source_id=source_id,
-                    module=module,
-                    item_year=search_year,
-                    query=query,
-                    cache_key=cache_key,
-                    client=client,
-                    sem=sem,
-                    timeout=timeout,
-                    breaker_ttl=breaker_ttl,
-                    provider_lock=provider_locks[source_id],
-                    stats=_stat(source_id),
-                    imdb_token=imdb_token,
-                    fragment=fragment,
-                )
+    client = _provider_client()
+    imdb_token = item.get("imdb_id") or item.get("id") or ""
+    fragment = item.get("normalized_fragment", "")
+    for source_id in sources:
+        module = nsub_module.SOURCE_REGISTRY[source_id]
+        query = nsub_module._normalise_for_source(source_id, item, search_str)
+        cache_key = nsub_module._provider_cache_key(source_id, query, search_year)
+        _stat(source_id)  # ensure entry exists
+        cached = nsub_module.PROVIDER_CACHE.get(cache_key)
+        if cached is not None:
+            count = len(cached or [])
+            _stat(source_id)["fetched"] += count
+            aggregated.extend(nsub_module._hydrate_results(source_id, cached))
+            continue
+        if nsub_module.FAILURE_CACHE.get(cache_key) is not None:
+            continue
+        timeout = _provider_timeout(source_id)
+        breaker_ttl = _provider_breaker_ttl(source_id)
+        pending_tasks.append(
+            _run_provider_task(
+                source_id=source_id,
+                module=module,
+                item_year=search_year,
+                query=query,
+                cache_key=cache_key,
+                client=client,
+                sem=sem,
+                timeout=timeout,
+                breaker_ttl=breaker_ttl,
+                provider_lock=provider_locks[source_id],
+                stats=_stat(source_id),
+                imdb_token=imdb_token,
+                fragment=fragment,
             )
+        )
 
-        if pending_tasks:
-            results = await asyncio.gather(*pending_tasks)
-            for source_id, cache_key, result in results:
-                if result:
-                    _stat(source_id)["fetched"] += len(result or [])
-                    nsub_module.PROVIDER_CACHE.set(cache_key, [dict(entry) for entry in result])
-                    aggregated.extend(nsub_module._hydrate_results(source_id, result))
+    if pending_tasks:
+        results = await asyncio.gather(*pending_tasks)
+        for source_id, cache_key, result in results:
+            if result:
+                _stat(source_id)["fetched"] += len(result or [])
+                nsub_module.PROVIDER_CACHE.set(cache_key, [dict(entry) for entry in result])
+                aggregated.extend(nsub_module._hydrate_results(source_id, result))
 
     if not aggregated:
         return [], provider_stats
@@ -456,8 +494,8 @@ async def check_bg_subs_availability(
     if EMPTY_CACHE.get(base_cache_key):
         return False
 
-    # Build item
-    item = build_scraper_item(media_type, raw_id)
+    # Build item (Cinemeta lookup uses blocking requests; keep it off the event loop)
+    item = await asyncio.to_thread(build_scraper_item, media_type, raw_id)
     if not item:
         return False
     
@@ -491,57 +529,57 @@ async def check_bg_subs_availability(
     stats = {"fetched": 0, "failed": 0, "timeouts": 0, "retries": 0}
     provider_lock = asyncio.Semaphore(1) # Simple lock for check
 
-    async with httpx.AsyncClient(timeout=None) as client:
-        imdb_token = item.get("imdb_id") or item.get("id") or ""
-        fragment = item.get("normalized_fragment", "")
+    client = _provider_client()
+    imdb_token = item.get("imdb_id") or item.get("id") or ""
+    fragment = item.get("normalized_fragment", "")
         
-        for source_id in sources:
-            module = nsub_module.SOURCE_REGISTRY[source_id]
-            query = nsub_module._normalise_for_source(source_id, item, search_str)
-            cache_key = nsub_module._provider_cache_key(source_id, query, search_year)
+    for source_id in sources:
+        module = nsub_module.SOURCE_REGISTRY[source_id]
+        query = nsub_module._normalise_for_source(source_id, item, search_str)
+        cache_key = nsub_module._provider_cache_key(source_id, query, search_year)
             
-            # Check provider cache
-            cached = nsub_module.PROVIDER_CACHE.get(cache_key)
-            if cached:
-                return True
-            if nsub_module.FAILURE_CACHE.get(cache_key):
-                continue
+        # Check provider cache
+        cached = nsub_module.PROVIDER_CACHE.get(cache_key)
+        if cached:
+            return True
+        if nsub_module.FAILURE_CACHE.get(cache_key):
+            continue
 
-            timeout = _provider_timeout(source_id)
-            # Use a shorter timeout for the check to fail fast
-            if timeout > 2.0:
-                timeout = 2.0
+        timeout = _provider_timeout(source_id)
+        # Use a shorter timeout for the check to fail fast
+        if timeout > 2.0:
+            timeout = 2.0
                 
-            pending_tasks.append(
-                _run_provider_task(
-                    source_id=source_id,
-                    module=module,
-                    item_year=search_year,
-                    query=query,
-                    cache_key=cache_key,
-                    client=client,
-                    sem=sem,
-                    timeout=timeout,
-                    breaker_ttl=None,
-                    provider_lock=provider_lock,
-                    stats=stats,
-                    imdb_token=imdb_token,
-                    fragment=fragment,
-                )
+        pending_tasks.append(
+            _run_provider_task(
+                source_id=source_id,
+                module=module,
+                item_year=search_year,
+                query=query,
+                cache_key=cache_key,
+                client=client,
+                sem=sem,
+                timeout=timeout,
+                breaker_ttl=None,
+                provider_lock=provider_lock,
+                stats=stats,
+                imdb_token=imdb_token,
+                fragment=fragment,
             )
+        )
 
-        if not pending_tasks:
-            return False
+    if not pending_tasks:
+        return False
 
-        # Race the tasks!
-        for future in asyncio.as_completed(pending_tasks):
-            try:
-                _, _, result = await future
-                if result:
-                    # Found something!
-                    return True
-            except Exception:
-                pass
+    # Race the tasks!
+    for future in asyncio.as_completed(pending_tasks):
+        try:
+            _, _, result = await future
+            if result:
+                # Found something!
+                return True
+        except Exception:
+            pass
     
     return False
 
@@ -651,6 +689,37 @@ def _decode_payload(token: str) -> Dict:
         )
 
 
+def _search_done(key: str, task: asyncio.Task) -> None:
+    if _SEARCH_TASKS.get(key) is task:
+        del _SEARCH_TASKS[key]
+    if not task.cancelled() and task.exception() is not None:
+        log.warning("[cache] subtitle search failed for %s: %s", key, task.exception())
+
+
+def _search_task(
+    base_cache_key: str,
+    media_type: str,
+    raw_id: str,
+    per_source: int,
+    player: Dict[str, str],
+) -> asyncio.Task:
+    task = _SEARCH_TASKS.get(base_cache_key)
+    if task is None:
+        task = asyncio.create_task(
+            _search_subtitles_uncached(base_cache_key, media_type, raw_id, per_source, player)
+        )
+        _SEARCH_TASKS[base_cache_key] = task
+        task.add_done_callback(lambda t: _search_done(base_cache_key, t))
+    return task
+
+
+def _keep_stale_on_failed_refresh(key: str, stale: List[Dict], task: asyncio.Task) -> None:
+    # An empty or failed refresh re-arms the last good results for a full TTL window, so
+    # later requests don't each start another provider fan-out while providers are down
+    if task.cancelled() or task.exception() is not None or not task.result():
+        RESULT_CACHE.set(key, stale)
+
+
 async def search_subtitles_async(
     media_type: str,
     raw_id: str,
@@ -659,18 +728,41 @@ async def search_subtitles_async(
 ) -> List[Dict]:
     player = player or {}
     base_cache_key = _result_cache_key(media_type, raw_id, per_source, player)
-    request_rid = REQUEST_ID.get("") or uuid.uuid4().hex
-    cache_guard_key = f"{base_cache_key}:{request_rid}"
-    resolved_ids: Dict[str, str] = {}
+    SERVED_STALE.set(False)
 
     cached = RESULT_CACHE.get(base_cache_key)
     if cached is not None:
         return cached
 
+    # Stale-while-revalidate: answer from the last good results and refresh in the background
+    with _STALE_LOCK:
+        stale = STALE_RESULT_CACHE.get(base_cache_key)
+    if stale:
+        if _debug_cache_enabled():
+            log.info("[cache] serving stale results for %s", base_cache_key)
+        if base_cache_key not in _SEARCH_TASKS:
+            refresh = _search_task(base_cache_key, media_type, raw_id, per_source, player)
+            refresh.add_done_callback(lambda t: _keep_stale_on_failed_refresh(base_cache_key, stale, t))
+        SERVED_STALE.set(True)
+        return stale
+
     if EMPTY_CACHE.get(base_cache_key) is not None:
         return []
 
-    item = build_scraper_item(media_type, raw_id)
+    return await asyncio.shield(_search_task(base_cache_key, media_type, raw_id, per_source, player))
+
+
+async def _search_subtitles_uncached(
+    base_cache_key: str,
+    media_type: str,
+    raw_id: str,
+    per_source: int,
+    player: Dict[str, str],
+) -> List[Dict]:
+    resolved_ids: Dict[str, str] = {}
+
+    # Cinemeta lookup uses blocking requests; keep it off the event loop
+    item = await asyncio.to_thread(build_scraper_item, media_type, raw_id)
     needs_title = not item or not (item.get("title") or "").strip()
     needs_year = not item or not (item.get("year") or "").strip()
     if FALLBACK_META_ENABLED and (needs_title or needs_year):
@@ -704,7 +796,7 @@ async def search_subtitles_async(
                 token = _extract_provider_token(raw_id)
                 if token:
                     resolved_ids["tmdb"] = token
-                resolved_title, resolved_year, resolved_imdb = _resolve_tmdb_metadata(raw_id)
+                resolved_title, resolved_year, resolved_imdb = await asyncio.to_thread(_resolve_tmdb_metadata, raw_id)
                 if resolved_title or resolved_year:
                     log.info(
                         "[metadata] tmdb fallback resolved title='%s' year=%s",
@@ -721,7 +813,7 @@ async def search_subtitles_async(
                 token = _extract_provider_token(raw_id)
                 if token:
                     resolved_ids["tvdb"] = token
-                resolved_title, resolved_year, resolved_imdb = _resolve_tvdb_metadata(raw_id)
+                resolved_title, resolved_year, resolved_imdb = await asyncio.to_thread(_resolve_tvdb_metadata, raw_id)
                 if resolved_title:
                     item["title"] = resolved_title
                 if resolved_year and not item.get("year"):
@@ -875,6 +967,8 @@ async def search_subtitles_async(
                 log.info("[cache] skip overwriting non-empty cache for %s", base_cache_key)
         else:
             RESULT_CACHE.set(base_cache_key, subtitles)
+        with _STALE_LOCK:
+            STALE_RESULT_CACHE[base_cache_key] = subtitles
     else:
         existing = RESULT_CACHE.get(base_cache_key)
         if existing and existing:
@@ -886,6 +980,19 @@ async def search_subtitles_async(
     return subtitles
 
 
+async def _search_subtitles_once(
+    media_type: str,
+    raw_id: str,
+    per_source: int,
+    player: Optional[Dict[str, str]],
+) -> List[Dict]:
+    # The loop ends with this call, so its provider connections are closed with it
+    try:
+        return await search_subtitles_async(media_type, raw_id, per_source=per_source, player=player)
+    finally:
+        await close_provider_client()
+
+
 def search_subtitles(
     media_type: str,
     raw_id: str,
@@ -896,7 +1003,7 @@ def search_subtitles(
     try:
         asyncio.get_running_loop()
     except RuntimeError:
-        return asyncio.run(search_subtitles_async(media_type, raw_id, per_source=per_source, player=player))
+        return asyncio.run(_search_subtitles_once(media_type, raw_id, per_source, player))
     raise RuntimeError("search_subtitles() cannot be used inside a running event loop; call search_subtitles_async().")
 
 
@@ -169,24 +169,24 @@ def read_sub(*items: Dict[str, str], enabled_sources: Optional[Iterable[str]] =
 
 
 def _invoke_source(source_id: str, module, item: Dict[str, str], query: str):
-    t0 = time.time()
+    t0 = time.monotonic()
     _rate_limit(source_id)
     fragment = item.get("normalized_fragment")
     if source_id == "unacs":
         out = module.read_sub(query, item.get("year", ""), fragment)
-        log_my(f"[metrics] provider={source_id} duration_ms={(time.time()-t0)*1000:.0f} count={len(out or [])}")
+        log_my(f"[metrics] provider={source_id} duration_ms={(time.monotonic()-t0)*1000:.0f} count={len(out or [])}")
         return out
     if source_id == "subs_sab":
         out = module.read_sub(query, item.get("year", ""), fragment)
-        log_my(f"[metrics] provider={source_id} duration_ms={(time.time()-t0)*1000:.0f} count={len(out or [])}")
+        log_my(f"[metrics] provider={source_id} duration_ms={(time.monotonic()-t0)*1000:.0f} count={len(out or [])}")
         return out
     if source_id == "subsland":
         out = module.read_sub(query, item.get("year", ""), fragment)
-        log_my(f"[metrics] provider={source_id} duration_ms={(time.time()-t0)*1000:.0f} count={len(out or [])}")
+        log_my(f"[metrics] provider={source_id} duration_ms={(time.monotonic()-t0)*1000:.0f} count={len(out or [])}")
         return out
     if source_id == "Vlad00nMooo":
         out = module.read_sub(query, item.get("year", ""), fragment)
-        log_my(f"[metrics] provider={source_id} duration_ms={(time.time()-t0)*1000:.0f} count={len(out or [])}")
+        log_my(f"[metrics] provider={source_id} duration_ms={(time.monotonic()-t0)*1000:.0f} count={len(out or [])}")
         return out
     if source_id == "opensubtitles":
         try:
@@ -197,7 +197,7 @@ def _invoke_source(source_id: str, module, item: Dict[str, str], query: str):
                 imdb_id=item.get("imdb_id") or item.get("id") or "",
                 language="bg",
             )
-            log_my(f"[metrics] provider={source_id} duration_ms={(time.time()-t0)*1000:.0f} count={len(out or [])}")
+            log_my(f"[metrics] provider={source_id} duration_ms={(time.monotonic()-t0)*1000:.0f} count={len(out or [])}")
             return out
         except Exception as exc:  # noqa: BLE001
             log_my(f"[metrics] provider={source_id} error={exc}")
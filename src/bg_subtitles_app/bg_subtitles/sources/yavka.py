@@ -182,7 +182,7 @@ def _parse_results(html: str) -> List[Dict]:
 
 def read_sub(query: str, year: Optional[str]) -> Optional[List[Dict]]:
     import time
-    t0 = time.time()
+    t0 = time.monotonic()
     log_my(f"[YAVKA] Search started for {query}")
     params = SEARCH_PARAMS_TEMPLATE.copy()
     params["sea"] = query
@@ -221,7 +221,7 @@ def read_sub(query: str, year: Optional[str]) -> Optional[List[Dict]]:
                 _t.sleep(2 ** attempt)
         if not html:
             log_my("[YAVKA] No results or blocked after retries")
-            log_my(f"[YAVKA] completed in {time.time()-t0:.2f}s (0 results)")
+            log_my(f"[YAVKA] completed in {time.monotonic()-t0:.2f}s (0 results)")
             return None
 
     if not html:
@@ -230,7 +230,7 @@ def read_sub(query: str, year: Optional[str]) -> Optional[List[Dict]]:
     results = _parse_results(html)
     results = _filter_results(results, query, year)
     if not results:
-        log_my(f"[YAVKA] completed in {time.time()-t0:.2f}s (0 results)")
+        log_my(f"[YAVKA] completed in {time.monotonic()-t0:.2f}s (0 results)")
         return None
 
     results = results[:25]
@@ -239,7 +239,7 @@ def read_sub(query: str, year: Optional[str]) -> Optional[List[Dict]]:
         for key in list_key:
             log_my("[YAVKA]", key, [entry.get(key) for entry in results])
 
-    log_my(f"[YAVKA] Completed in {time.time()-t0:.2f}s, {len(results)} results")
+    log_my(f"[YAVKA] Completed in {time.monotonic()-t0:.2f}s, {len(results)} results")
 
     return results
 
@@ -29,7 +29,7 @@ if [[ "${MODE}" == "buildpack" ]]; then
     --archive "${ARCHIVE_ID}" \
     --archive-builder buildpack \
     --archive-buildpack-build-command "pip install --no-cache-dir -r requirements.txt" \
-    --archive-buildpack-run-command "uvicorn src.app:app --host 0.0.0.0 --port 8080" \
+    --archive-buildpack-run-command "uvicorn src.app:app --host 0.0.0.0 --port 8080 --loop uvloop --http httptools" \
     --env PYTHONPATH=src \
     --env UVICORN_PORT=8080 \
     -o json | jq -r '.latest_deployment_id'
@@ -1,6 +1,6 @@
 import httpx
 import bisect
-import json
+import orjson
 import asyncio
 
 # Map for IDs
@@ -17,12 +17,12 @@ current_dir = os.path.dirname(os.path.abspath(__file__))
 anidb_extension_path = os.path.join(current_dir, "anidb_extension.json")
 anime_mapping_extension_path = os.path.join(current_dir, "anime_mapping_extension.json")
 
-with open(anidb_extension_path, "r", encoding="utf-8") as f:
-    anidb_extension = json.load(f) 
+with open(anidb_extension_path, "rb") as f:
+    anidb_extension = orjson.loads(f.read())
 
 # Load anime mapping Extension from file
-with open(anime_mapping_extension_path, "r", encoding="utf-8") as f:
-    anime_mapping_extension = json.load(f) 
+with open(anime_mapping_extension_path, "rb") as f:
+    anime_mapping_extension = orjson.loads(f.read())
 
 async def download_maps():
     global anime_id_map, anime_season_map
@@ -32,8 +32,9 @@ async def download_maps():
             client.get(anime_db_map_url)
         ]
         results = await asyncio.gather(*tasks)
-        anime_id_map = results[0].json() + anime_mapping_extension
-        anime_season_map = {**results[1].json(), **anidb_extension}
+        # Both lists are several MB; orjson keeps the startup parse short
+        anime_id_map = orjson.loads(results[0].content) + anime_mapping_extension
+        anime_season_map = {**orjson.loads(results[1].content), **anidb_extension}
         
 
 def load_kitsu_map() -> dict:
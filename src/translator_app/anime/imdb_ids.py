@@ -0,0 +1,44 @@
+import asyncio
+
+import httpx
+
+from src.translator_app.http_client import get_http_client
+
+# Caps addon lookups in flight across all catalogs, so a large uncached page cannot flood the addon
+_fetch_sem = asyncio.Semaphore(10)
+
+
+async def fetch_imdb_id(client: httpx.AsyncClient, cache, addon_url: str, anime_id: str, type: str):
+	"""Look up the imdb id of a kitsu / mal id on its addon and remember the answer in cache."""
+	async with _fetch_sem:
+		response = await client.get(f"{addon_url}/meta/{type}/{anime_id.replace(':','%3A')}.json", timeout=20)
+	try:
+		imdb_id = response.json()['meta']['imdb_id']
+		cache.set(anime_id, imdb_id)
+		return imdb_id, True
+	except (KeyError, IndexError, TypeError, ValueError):
+		# If imdb_id not found save the anime id as imdb_id (better performance)
+		cache.set(anime_id, anime_id)
+		return anime_id, False
+
+
+async def convert_to_imdb_many(cache, addon_url: str, items: list) -> dict:
+	"""Convert (id, type) pairs in one go; cache misses are fetched concurrently on the shared client."""
+	results = {}
+	misses = {}
+	for anime_id, type in items:
+		if anime_id in results or anime_id in misses:
+			continue
+		imdb_id = cache.get(anime_id)
+		if imdb_id is None:
+			misses[anime_id] = type
+		else:
+			results[anime_id] = imdb_id
+
+	if misses:
+		client = get_http_client()
+		fetched = await asyncio.gather(*[fetch_imdb_id(client, cache, addon_url, anime_id, type) for anime_id, type in misses.items()])
+		for anime_id, (imdb_id, _) in zip(misses, fetched, strict=True):
+			results[anime_id] = imdb_id
+
+	return results
@@ -2,7 +2,8 @@ from src.translator_app.cache import Cache
 from datetime import timedelta
 import httpx
 import re
-from src.translator_app.anime import anime_mapping
+from src.translator_app.anime import anime_mapping, imdb_ids
+from src.translator_app.http_client import get_http_client
 
 kitsu_addon_url = 'https://anime-kitsu.strem.fun'
 
@@ -40,16 +41,7 @@ async def convert_to_imdb(kitsu_id: str, type: str):
 	is_converted = False
 	imdb_id = kitsu_cache_ids.get(kitsu_id)
 	if imdb_id == None:
-		async with httpx.AsyncClient(follow_redirects=True, timeout=20) as client:
-			response = await client.get(f"{kitsu_addon_url}/meta/{type}/{kitsu_id.replace(':','%3A')}.json")
-			try:
-				imdb_id = response.json()['meta']['imdb_id']
-				kitsu_cache_ids.set(kitsu_id, imdb_id)
-				is_converted = True
-			except:
-				# If imdb_id not found save kitsu_id as imdb_id (better performance)
-				kitsu_cache_ids.set(kitsu_id, kitsu_id)
-				return kitsu_id, is_converted
+		return await _fetch_imdb_id(get_http_client(), kitsu_id, type)
 	else:
 		if 'tt' not in imdb_id:
 			is_converted = False
@@ -59,6 +51,15 @@ async def convert_to_imdb(kitsu_id: str, type: str):
 	return imdb_id, is_converted
 
 
+async def _fetch_imdb_id(client: httpx.AsyncClient, kitsu_id: str, type: str):
+	return await imdb_ids.fetch_imdb_id(client, kitsu_cache_ids, kitsu_addon_url, kitsu_id, type)
+
+
+async def convert_to_imdb_many(items: list) -> dict:
+	"""Convert (id, type) pairs in one go; see imdb_ids.convert_to_imdb_many."""
+	return await imdb_ids.convert_to_imdb_many(kitsu_cache_ids, kitsu_addon_url, items)
+
+
 def parse_meta_videos(videos: dict, imdb_id: str) -> dict:
 	kitsu_ids = imdb_ids_map[imdb_id]['kitsu_ids']
 	special_offset = 0
@@ -2,7 +2,8 @@ from src.translator_app.cache import Cache
 from datetime import timedelta
 import httpx
 import re
-from src.translator_app.anime import anime_mapping
+from src.translator_app.anime import anime_mapping, imdb_ids
+from src.translator_app.http_client import get_http_client
 
 kitsu_addon_url = 'https://anime-kitsu.strem.fun'
 
@@ -44,16 +45,7 @@ async def convert_to_imdb(mal_id: str, type: str) -> str:
 	is_converted = False
 	imdb_id = mal_cache_ids.get(mal_id)
 	if imdb_id == None:
-		async with httpx.AsyncClient(follow_redirects=True, timeout=20) as client:
-			response = await client.get(f"{kitsu_addon_url}/meta/{type}/{mal_id.replace(':','%3A')}.json")
-			try:
-				imdb_id = response.json()['meta']['imdb_id']
-				mal_cache_ids.set(mal_id, imdb_id)
-				is_converted = True
-			except:
-				# If imdb_id not found save mal_id as imdb_id (better performance)
-				mal_cache_ids.set(mal_id, mal_id)
-				return mal_id, is_converted
+		return await _fetch_imdb_id(get_http_client(), mal_id, type)
 	else:
 		if 'tt' not in imdb_id:
 			is_converted = False
@@ -61,3 +53,12 @@ async def convert_to_imdb(mal_id: str, type: str) -> str:
 			is_converted = True
 
 	return imdb_id, is_converted
+
+
+async def _fetch_imdb_id(client: httpx.AsyncClient, mal_id: str, type: str):
+	return await imdb_ids.fetch_imdb_id(client, mal_cache_ids, kitsu_addon_url, mal_id, type)
+
+
+async def convert_to_imdb_many(items: list) -> dict:
+	"""Convert (id, type) pairs in one go; see imdb_ids.convert_to_imdb_many."""
+	return await imdb_ids.convert_to_imdb_many(mal_cache_ids, kitsu_addon_url, items)
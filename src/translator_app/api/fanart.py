@@ -1,4 +1,5 @@
 import httpx
+import orjson
 import os
 
 #from dotenv import load_dotenv
@@ -15,7 +16,7 @@ async def get_fanart_movie(client: httpx.AsyncClient, id: str) -> dict:
     url = f"http://webservice.fanart.tv/v3/movies/{id}"
     reponse = await client.get(url, params=params)
 
-    return reponse.json()
+    return orjson.loads(reponse.content)
 
 
 async def get_fanart_series(client: httpx.AsyncClient, id: str) -> dict:
@@ -5,6 +5,7 @@ import httpx
 import os
 import asyncio
 import json
+import orjson
 
 #from dotenv import load_dotenv
 #load_dotenv()
@@ -56,7 +57,7 @@ async def fetch_and_retry(client: httpx.AsyncClient, id: str, url: str, language
             response = await client.get(url, headers=headers, params=params)
 
             if response.status_code == 200:
-                meta_dict = response.json()
+                meta_dict = orjson.loads(response.content)
 
                 # Only imdb_id cache save
                 if 'tt' in str(id):
@@ -117,6 +118,16 @@ async def get_series_details(client: httpx.AsyncClient, id: str, language: str,
     return await fetch_and_retry(client, id, url, language, params=params)
 
 
+# Get only the external ids (imdb_id, tvdb_id, ...) of a movie or series
+async def get_external_ids(client: httpx.AsyncClient, id: str, type: str, language: str, api_key: str) -> dict:
+    params = {
+        "api_key": api_key
+    }
+    media = 'tv' if type == 'series' else 'movie'
+    url = f"https://api.themoviedb.org/3/{media}/{id}/external_ids"
+    return await fetch_and_retry(client, id, url, language, params=params)
+
+
 # Get series detail with cast video and images
 async def get_season_details(client: httpx.AsyncClient, season_id: str, season_number, language: str, api_key: str) -> dict:
     params = {
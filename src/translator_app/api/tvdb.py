@@ -4,6 +4,7 @@ import httpx
 import asyncio
 import os
 import json
+import orjson
 
 #from dotenv import load_dotenv
 #load_dotenv()
@@ -50,7 +51,7 @@ async def fetch_and_retry(client: httpx.AsyncClient, url: str, token='', type='G
             response = await client.post(url, headers=headers, json=payload, params=params)
 
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             # Cache token
             if type == 'POST':
                 token_cache.set('token', data['data']['token'])
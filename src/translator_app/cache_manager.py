@@ -10,14 +10,30 @@ from src.translator_app import stream_probe
 
 # Cache set
 meta_cache = {}
+catalog_cache = None
+meta_negative_cache = None
 
 def get_meta_cache(language: str):
-    global meta_cache
-    if language not in meta_cache:
+    # Hot path: a single dict lookup once the language handle exists
+    cache = meta_cache.get(language)
+    if cache is None:
         cache_dir = Path(f"./cache/{language}/meta/tmp")
         cache_dir.mkdir(parents=True, exist_ok=True)
-        meta_cache[language] = Cache(cache_dir, timedelta(hours=12).total_seconds())
-    return meta_cache[language]
+        cache = meta_cache[language] = Cache(cache_dir, timedelta(hours=12).total_seconds())
+    return cache
+
+def get_catalog_cache():
+    global catalog_cache
+    if catalog_cache is None:
+        catalog_cache = Cache("./cache/catalog/tmp", timedelta(minutes=5).total_seconds())
+    return catalog_cache
+
+def get_meta_negative_cache():
+    # Ids that resolved to an empty meta, kept briefly to stop repeated upstream fan-outs
+    global meta_negative_cache
+    if meta_negative_cache is None:
+        meta_negative_cache = Cache("./cache/meta_negative/tmp", timedelta(minutes=10).total_seconds())
+    return meta_negative_cache
 
 def open_all_cache():
     kitsu.open_cache()
@@ -25,25 +41,30 @@ def open_all_cache():
     tmdb.open_cache()
     tvdb.open_cache()
     # open_cache() # local meta cache lazy init
+    get_catalog_cache()
+    get_meta_negative_cache()
     translator.open_cache()
     letterboxd.open_cache()
     stream_probe.open_cache()
 
 def close_all_cache():
-    global meta_cache
+    global meta_cache, catalog_cache, meta_negative_cache
     kitsu.close_cache()
     mal.close_cache()
     tmdb.close_cache()
     tvdb.close_cache()
-    for language in meta_cache:
-        meta_cache[language].close()
+    for cache in meta_cache.values():
+        cache.close()
+    if catalog_cache is not None:
+        catalog_cache.close()
+        catalog_cache = None
+    if meta_negative_cache is not None:
+        meta_negative_cache.close()
+        meta_negative_cache = None
     translator.close_cache()
     letterboxd.close_cache()
     stream_probe.close_cache()
 
 def get_cache_length():
-    global meta_cache
-    total_len = 0
-    for cache in meta_cache.values():
-        total_len += cache.get_len()
-    return total_len
+    # diskcache keeps a running item count, so each len() is a single settings read
+    return sum(cache.get_len() for cache in meta_cache.values())
@@ -0,0 +1,27 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+def _forget(registry: Dict[Hashable, asyncio.Task], key: Hashable, task: asyncio.Task) -> None:
+    if registry.get(key) is task:
+        del registry[key]
+    # Mark the exception as retrieved in case nobody was waiting any more
+    if not task.cancelled():
+        task.exception()
+
+
+async def coalesce(registry: Dict[Hashable, asyncio.Task], key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+    """Run factory() once per key while it is in flight; concurrent callers share its result.
+
+    The work runs in its own task and every caller awaits it shielded, so a caller that is
+    cancelled (a client disconnecting) neither stops the work nor fails the other callers.
+    Results are shared as is, so factories should return immutable values such as bytes.
+    """
+    task = registry.get(key)
+    if task is None:
+        task = asyncio.ensure_future(factory())
+        registry[key] = task
+        task.add_done_callback(lambda t: _forget(registry, key, t))
+    return await asyncio.shield(task)
@@ -7,6 +7,21 @@ cloudflare_cache_headers = {
     'Surrogate-Control': 'no-store'
 }
 
+# Translated catalogs are served from a short-lived output cache, so the edge may keep them too
+catalog_cache_headers = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': '*',
+    'Cache-Control': 'public, max-age=300'
+}
+
+# Pre-encoded (name, value) pairs of the header sets above for Response.raw_headers
+cloudflare_cache_raw_headers = tuple(
+    (k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in cloudflare_cache_headers.items()
+)
+catalog_cache_raw_headers = tuple(
+    (k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in catalog_cache_headers.items()
+)
+
 stremio_headers = {
     'connection': 'keep-alive', 
     'user-agent': 'Mozilla/5.0 (Windows NT 6.2; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) QtWebEngine/5.15.2 Chrome/83.0.4103.122 Safari/537.36 StremioShell/4.4.168', 
@@ -29,6 +44,7 @@ cinemeta_url = 'https://v3-cinemeta.strem.io'
 # Stream enrichment constants
 BULGARIAN_FLAG = "🇧🇬"
 DISC_ICON = "💿"
+AUDIO_ICON = "🔊"
 MAX_STREAM_NAME_LENGTH = 32
 ENRICH_LEVEL_DISABLED = 0
 ENRICH_LEVEL_SCRAPER_ONLY = 1
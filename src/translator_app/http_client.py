@@ -0,0 +1,67 @@
+from typing import Dict
+
+import httpx
+
+from src.translator_app.constants import cinemeta_url
+from src.translator_app.settings import settings
+
+RD_API_BASE = "https://api.real-debrid.com/rest/1.0"
+
+# Per-upstream timeouts; slow hosts get their own budget
+HTTP_TIMEOUTS = {
+    "generic": settings.request_timeout,
+    "rd": settings.request_timeout,
+    "cinemeta": 30,
+    "tmdb_addon": 30,
+    "subs": settings.request_timeout,
+    "letterboxd": 30,
+}
+
+# Per-upstream pool sizes, so slow RD polls cannot starve catalog/meta fan-out
+HTTP_LIMITS = {
+    "generic": httpx.Limits(max_keepalive_connections=50, max_connections=200, keepalive_expiry=30.0),
+    "rd": httpx.Limits(max_keepalive_connections=10, max_connections=20, keepalive_expiry=30.0),
+    "cinemeta": httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=30.0),
+    "tmdb_addon": httpx.Limits(max_keepalive_connections=20, max_connections=50, keepalive_expiry=30.0),
+    "subs": httpx.Limits(max_keepalive_connections=10, max_connections=50, keepalive_expiry=30.0),
+    "letterboxd": httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0),
+}
+
+# App-lifetime clients shared by the routers so upstream connections are kept alive
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+def _base_url(name: str) -> str:
+    if name == "rd":
+        return RD_API_BASE
+    if name == "cinemeta":
+        return cinemeta_url
+    if name == "subs":
+        return settings.subs_proxy_base
+    return ""
+
+def _build_client(name: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=_base_url(name),
+        follow_redirects=True,
+        timeout=HTTP_TIMEOUTS[name],
+        limits=HTTP_LIMITS[name],
+    )
+
+def open_http_client(name: str = "generic") -> httpx.AsyncClient:
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        client = _clients[name] = _build_client(name)
+    return client
+
+def open_all_http_clients():
+    for name in HTTP_LIMITS:
+        open_http_client(name)
+
+async def close_all_http_clients():
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
+
+def get_http_client(name: str = "generic") -> httpx.AsyncClient:
+    """Return the shared client for an upstream, creating it lazily when the lifespan did not run."""
+    return open_http_client(name)
@@ -1,18 +1,21 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import FileResponse, Response
 from contextlib import asynccontextmanager
 import os
+import asyncio
 import sys
-import json
 import logging
+import orjson
+from pathlib import Path
 
 # Ensure bundled bg_subtitles is importable
 
 from src.translator_app.settings import settings
 from src.translator_app.logger import setup_logging
-from src.translator_app.constants import cloudflare_cache_headers
+from src.translator_app.responses import json_bytes_response
 from src.translator_app.cache_manager import open_all_cache, close_all_cache
+from src.translator_app.http_client import open_all_http_clients, close_all_http_clients
 from src.translator_app.anime import kitsu, mal, anime_mapping
 
 from src.translator_app.routers import manifest, catalog, meta, configure, subtitles, streams, dashboard
@@ -20,11 +23,20 @@ from src.translator_app.routers import manifest, catalog, meta, configure, subti
 setup_logging()
 logger = logging.getLogger("toast-translator")
 
+# Mounted apps get no lifespan events, so the BG subtitles shutdown is run from ours
+bg_shutdown = None
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info('Started')
     # Open Cache
     open_all_cache()
+    # Shared upstream HTTP clients
+    open_all_http_clients()
+    # Keep the TMDB addon pool ordered by health (skip in testing to avoid network)
+    tmdb_probe_task = None
+    if settings.use_tmdb_addon and not settings.testing:
+        tmdb_probe_task = asyncio.create_task(meta.reprobe_tmdb_addons_forever())
     # Load anime mapping lists (skip in testing to avoid network)
     if settings.enable_anime and not settings.testing:
         await anime_mapping.download_maps()
@@ -32,6 +44,11 @@ async def lifespan(app: FastAPI):
         mal.load_anime_map()
     yield
     logger.info('Shutdown')
+    if tmdb_probe_task is not None:
+        tmdb_probe_task.cancel()
+    await close_all_http_clients()
+    if bg_shutdown is not None:
+        await bg_shutdown()
     # Cache close
     close_all_cache()
 
@@ -44,7 +61,7 @@ app.mount("/static", StaticFiles(directory=static_dir), name="static")
 
 # Mount local BG subtitles under /bg
 try:
-    from src.bg_subtitles_app.app import app as bg_app
+    from src.bg_subtitles_app.app import app as bg_app, shutdown as bg_shutdown
     app.mount("/bg", bg_app)
     logger.info("Successfully mounted BG subtitles app at /bg")
 except ImportError as exc:
@@ -67,33 +84,24 @@ app.include_router(dashboard.router)
 async def get_poster_placeholder():
     return FileResponse(os.path.join(static_dir, "img", "toast-translator-logo.png"), media_type="image/png")
 
+# Static bodies, parsed once and served with pre-encoded headers
+HEALTHZ_BODY = orjson.dumps({"status": "ok"})
+WAKE_BODY = orjson.dumps({"status": "awake"})
+with open(Path(__file__).resolve().parent / "languages" / "languages.json", "rb") as f:
+    LANGUAGES_BODY = orjson.dumps(orjson.loads(f.read()))
+
 # Languages
 @app.get('/languages.json')
-async def get_languages() -> JSONResponse:
+async def get_languages() -> Response:
     """Return available language translations."""
-    try:
-        languages_path = os.path.join(current_dir, "languages", "languages.json")
-        with open(languages_path, "r", encoding="utf-8") as f:
-            return JSONResponse(content=json.load(f), headers=cloudflare_cache_headers)
-    except FileNotFoundError:
-        logger.error("Languages file not found at languages/languages.json")
-        return JSONResponse(
-            content={"error": "Languages file not found"}, 
-            status_code=404
-        )
-    except json.JSONDecodeError as e:
-        logger.error(f"Invalid languages JSON: {e}")
-        return JSONResponse(
-            content={"error": "Invalid languages file"}, 
-            status_code=500
-        )
+    return json_bytes_response(LANGUAGES_BODY)
 
 # Health check
 @app.get('/healthz')
 async def healthz():
-    return JSONResponse(content={"status": "ok"}, headers=cloudflare_cache_headers)
+    return json_bytes_response(HEALTHZ_BODY)
 
 # Lightweight wake endpoint
 @app.get('/wake')
 async def wake():
-    return JSONResponse(content={"status": "awake"}, headers=cloudflare_cache_headers)
+    return json_bytes_response(WAKE_BODY)
@@ -2,13 +2,14 @@ from src.translator_app.api import tmdb, tvdb, fanart
 from src.translator_app.anime import kitsu, mal
 from src.translator_app.providers import letterboxd
 from src.translator_app import translator
+from src.translator_app.http_client import get_http_client
 import httpx
 import asyncio
 import urllib.parse
 import math
 import json
+import orjson
 
-REQUEST_TIMEOUT = 100
 MAX_CAST_SEARCH = 3
 TMDB_ERROR_EPISODE_OFFSET = 50
 MAX_TRANSLATE_EPISODES = 20
@@ -22,6 +23,14 @@ tmdb_exceptions_path = os.path.join(current_dir, "anime", "tmdb_exceptions.json"
 with open(tmdb_exceptions_path, "r", encoding="utf-8") as f:
     TMDB_EXCEPTIONS = json.load(f) 
 
+def cinemeta_body(response) -> dict:
+    """Parse a Cinemeta meta response: {'meta': {}} when the id is unknown, {} when Cinemeta is unavailable."""
+    if response.status_code == 200:
+        return orjson.loads(response.content)
+    if response.status_code == 404:
+        return {'meta': {}}
+    return {}
+
 async def build_metadata(imdb_id: str, type: str, language: str, tmdb_key: str):
     tmdb_id = None
     if 'tt' in imdb_id:
@@ -41,97 +50,94 @@ async def build_metadata(imdb_id: str, type: str, language: str, tmdb_key: str):
             }
         }, {}
 
-    async with httpx.AsyncClient(follow_redirects=True, timeout=REQUEST_TIMEOUT) as client:
-
-        if type == 'movie':
-            parse_title = 'title'
-            default_video_id = imdb_id
-            has_scheduled_videos = False
-            tasks = [
-                tmdb.get_movie_details(client, tmdb_id, language, tmdb_key),
-                fanart.get_fanart_movie(client, tmdb_id)
-            ]
-
-        elif type == 'series':
-            parse_title = 'name'
-            default_video_id = None
-            has_scheduled_videos = True
-            tasks = [
-                tmdb.get_series_details(client, tmdb_id, language, tmdb_key),
-                fanart.get_fanart_series(client, tmdb_id)
-            ]
-        
-        tasks.append(client.get(f"https://v3-cinemeta.strem.io/meta/{type}/{imdb_id}.json"))
-        data = await asyncio.gather(*tasks)
-        tmdb_data, fanart_data = data[0], data[1]
-        if data[2].status_code == 200:
-            cinemeta_data = data[2].json()
-        else:
-            cinemeta_data = {'meta': {}}
-        
-        # Empty tmdb data
-        if len(tmdb_data) == 0:
-            return {"meta": {}}, cinemeta_data
-
-        # Invalid TMDB key error
-        if tmdb_data.get('error'):
-            return { 
-                    "meta": {
-                        "id": "error:tmdb-key",
-                        "name": "Invalid TMDB Key",
-                        "description": "Invalid TMDB Key",
-                        "poster": "https://i.imgur.com/Zi5UZV3.png",
-                        "type": type
-                    }
-            }, {}
-        
-        title = tmdb_data.get(parse_title, '')
-        poster_path = tmdb_data.get('poster_path', '')
-        backdrop_path = tmdb_data.get('backdrop_path', '')
-        slug = f"{type}/{title.lower().replace(' ', '-')}-{tmdb_data.get('imdb_id', '').replace('tt', '')}"
-        logo = extract_logo(fanart_data, tmdb_data, cinemeta_data, language)
-        directors, writers= extract_crew(tmdb_data)
-        cast = extract_cast(tmdb_data)
-        genres = extract_genres(tmdb_data)
-        year = extract_year(tmdb_data, type)
-        trailers = extract_trailers(tmdb_data)
-        rating = cinemeta_data.get('meta', {}).get('imdbRating', '')
-
-        meta = {
-            "meta": {
-                "imdb_id": tmdb_data.get('imdb_id',''),
-                "name": title,
-                "type": type,
-                "cast": cast,
-                "country": (tmdb_data.get('origin_country') or [''])[0],
-                "description": tmdb_data.get('overview', ''),
-                "director": directors,
-                "genre": genres,
-                "imdbRating": rating,
-                "released": tmdb_data.get('release_date', 'TBA')+'T00:00:00.000Z' if type == 'movie' else tmdb_data.get('first_air_date', 'TBA')+'T00:00:00.000Z',
-                "slug": slug,
-                "writer": writers,
-                "year": year,
-                "poster": tmdb.TMDB_POSTER_URL + poster_path if poster_path else None,
-                "background": tmdb.TMDB_BACK_URL + backdrop_path if backdrop_path else None,
-                "logo": logo,
-                "runtime": convert_minutes_hours(tmdb_data.get('runtime','')) if type == 'movie' else convert_minutes_hours(extract_series_episode_runtime(tmdb_data, cinemeta_data)),
-                "id": 'tmdb:' + str(tmdb_data.get('id', '')),
-                "genres": genres,
-                "releaseInfo": year,
-                "trailerStreams": trailers,
-                "links": build_links(imdb_id, title, slug, rating, cast, writers, directors, genres),
-                "behaviorHints": {
-                    "defaultVideoId": default_video_id,
-                    "hasScheduledVideos": has_scheduled_videos
+    client = get_http_client()
+
+    if type == 'movie':
+        parse_title = 'title'
+        default_video_id = imdb_id
+        has_scheduled_videos = False
+        tasks = [
+            tmdb.get_movie_details(client, tmdb_id, language, tmdb_key),
+            fanart.get_fanart_movie(client, tmdb_id)
+        ]
+
+    elif type == 'series':
+        parse_title = 'name'
+        default_video_id = None
+        has_scheduled_videos = True
+        tasks = [
+            tmdb.get_series_details(client, tmdb_id, language, tmdb_key),
+            fanart.get_fanart_series(client, tmdb_id)
+        ]
+    
+    tasks.append(client.get(f"https://v3-cinemeta.strem.io/meta/{type}/{imdb_id}.json"))
+    data = await asyncio.gather(*tasks)
+    tmdb_data, fanart_data = data[0], data[1]
+    cinemeta_data = cinemeta_body(data[2])
+    
+    # Empty tmdb data
+    if len(tmdb_data) == 0:
+        return {"meta": {}}, cinemeta_data
+
+    # Invalid TMDB key error
+    if tmdb_data.get('error'):
+        return { 
+                "meta": {
+                    "id": "error:tmdb-key",
+                    "name": "Invalid TMDB Key",
+                    "description": "Invalid TMDB Key",
+                    "poster": "https://i.imgur.com/Zi5UZV3.png",
+                    "type": type
                 }
+        }, {}
+    
+    title = tmdb_data.get(parse_title, '')
+    poster_path = tmdb_data.get('poster_path', '')
+    backdrop_path = tmdb_data.get('backdrop_path', '')
+    slug = f"{type}/{title.lower().replace(' ', '-')}-{tmdb_data.get('imdb_id', '').replace('tt', '')}"
+    logo = extract_logo(fanart_data, tmdb_data, cinemeta_data, language)
+    directors, writers= extract_crew(tmdb_data)
+    cast = extract_cast(tmdb_data)
+    genres = extract_genres(tmdb_data)
+    year = extract_year(tmdb_data, type)
+    trailers = extract_trailers(tmdb_data)
+    rating = cinemeta_data.get('meta', {}).get('imdbRating', '')
+
+    meta = {
+        "meta": {
+            "imdb_id": tmdb_data.get('imdb_id',''),
+            "name": title,
+            "type": type,
+            "cast": cast,
+            "country": (tmdb_data.get('origin_country') or [''])[0],
+            "description": tmdb_data.get('overview', ''),
+            "director": directors,
+            "genre": genres,
+            "imdbRating": rating,
+            "released": tmdb_data.get('release_date', 'TBA')+'T00:00:00.000Z' if type == 'movie' else tmdb_data.get('first_air_date', 'TBA')+'T00:00:00.000Z',
+            "slug": slug,
+            "writer": writers,
+            "year": year,
+            "poster": tmdb.TMDB_POSTER_URL + poster_path if poster_path else None,
+            "background": tmdb.TMDB_BACK_URL + backdrop_path if backdrop_path else None,
+            "logo": logo,
+            "runtime": convert_minutes_hours(tmdb_data.get('runtime','')) if type == 'movie' else convert_minutes_hours(extract_series_episode_runtime(tmdb_data, cinemeta_data)),
+            "id": 'tmdb:' + str(tmdb_data.get('id', '')),
+            "genres": genres,
+            "releaseInfo": year,
+            "trailerStreams": trailers,
+            "links": build_links(imdb_id, title, slug, rating, cast, writers, directors, genres),
+            "behaviorHints": {
+                "defaultVideoId": default_video_id,
+                "hasScheduledVideos": has_scheduled_videos
             }
         }
+    }
 
-        if type == 'series':
-            meta['meta']['videos'] = await series_build_episodes(client, imdb_id, tmdb_id, tmdb_data.get('seasons', []), tmdb_data['external_ids']['tvdb_id'], tmdb_data['number_of_episodes'], language, tmdb_key)
+    if type == 'series':
+        meta['meta']['videos'] = await series_build_episodes(client, imdb_id, tmdb_id, tmdb_data.get('seasons', []), tmdb_data['external_ids']['tvdb_id'], tmdb_data['number_of_episodes'], language, tmdb_key)
 
-        return meta, cinemeta_data
+    return meta, cinemeta_data
 
 
 async def series_build_episodes(client: httpx.AsyncClient, imdb_id: str, tmdb_id: str, seasons: list, tvdb_series_id: int, tmdb_episodes_count: int, language: str, tmdb_key: str) -> list:
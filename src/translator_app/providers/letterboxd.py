@@ -4,19 +4,29 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import json
+import functools
+import itertools
+import logging
+import re
 from datetime import timedelta
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import httpx
+import orjson
+from cachetools import TTLCache
 
 from src.translator_app.cache import Cache
+from src.translator_app.coalesce import coalesce
 from src.translator_app.api import tmdb
 
+logger = logging.getLogger(__name__)
+
 LETTERBOXD_RESOLVE_BASE = "https://lbxd-id.almosteffective.com/letterboxd"
 LETTERBOXD_ADDON_BASE = "https://letterboxd.almosteffective.com"
 
 resolve_cache: Optional[Cache] = None
+# In-process layer over resolve_cache, so slugs of popular lists skip the SQLite round trip
+_memory_cache: TTLCache = TTLCache(maxsize=2048, ttl=timedelta(hours=1).total_seconds())
 
 
 def open_cache() -> None:
@@ -42,29 +52,52 @@ def get_cache_lenght() -> int:  # spelling kept for parity with other modules
     return resolve_cache.get_len()
 
 
+def _read_resolutions(cache: Cache, cache_keys: List[str]) -> List[Tuple[str, Any]]:
+    return [(cache_key, cache.get(cache_key)) for cache_key in cache_keys]
+
+
+async def _get_cached_resolutions(cache_keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Return the cached resolutions for cache_keys, reading memory misses from disk in one thread hop."""
+
+    found: Dict[str, Dict[str, Any]] = {}
+    disk_keys: List[str] = []
+    for cache_key in cache_keys:
+        cached = _memory_cache.get(cache_key)
+        if cached is None:
+            disk_keys.append(cache_key)
+        else:
+            found[cache_key] = cached
+
+    if disk_keys and resolve_cache is not None:
+        # SQLite reads block; keep them off the event loop
+        on_disk = await asyncio.to_thread(_read_resolutions, resolve_cache, disk_keys)
+        for cache_key, cached in on_disk:
+            if cached:
+                _memory_cache[cache_key] = cached
+                found[cache_key] = cached
+    return found
+
+
+# letterboxd:<slug> | letterboxd:id:<id> | letterboxd:error[:...] | letterboxd:<x>:<slug>
+_IDENTIFIER_RE = re.compile(r"letterboxd:(?:(id|error):(.*)|([^:]+)|[^:]*:(.*))")
+
+
 def _normalise_identifier(identifier: str) -> Optional[Tuple[str, str, str]]:
     """Convert a Letterboxd identifier into (mode, value, cache_key)."""
 
-    if not identifier or not identifier.startswith("letterboxd:"):
+    match = _IDENTIFIER_RE.fullmatch(identifier) if identifier else None
+    if not match:
         return None
 
-    parts = identifier.split(":", 2)
-    if len(parts) == 2:
-        slug = parts[1]
-        if not slug or slug == "error":
-            return None
-        return "slug", slug, slug
-
-    if len(parts) == 3:
-        if parts[1] == "id":
-            return "id", parts[2], f"id:{parts[2]}"
-        if parts[1] == "error":
-            return None
+    prefix, value, slug, tail = match.groups()
+    if prefix == "id":
+        return "id", value, f"id:{value}"
+    if prefix == "error" or slug == "error":
+        return None
+    if slug is None:
         # unexpected extra section, fall back to treating the tail as slug
-        slug = parts[2]
-        return "slug", slug, slug
-
-    return None
+        slug = tail
+    return "slug", slug, slug
 
 
 async def resolve_identifier(
@@ -72,17 +105,35 @@ async def resolve_identifier(
 ) -> Optional[Dict[str, Any]]:
     """Resolve a Letterboxd slug/id into tmdb and imdb identifiers."""
 
-    global resolve_cache
-
     parsed = _normalise_identifier(identifier)
     if not parsed:
         return None
 
     mode, value, cache_key = parsed
-    cached = resolve_cache.get(cache_key) if resolve_cache else None
+    cached = (await _get_cached_resolutions((cache_key,))).get(cache_key)
     if cached:
         return cached
 
+    return await _fetch_resolution(client, mode, value, cache_key)
+
+
+# Resolver requests in flight, so concurrent catalogs sharing a slug make one request
+_inflight: Dict[str, asyncio.Task] = {}
+
+
+async def _fetch_resolution(
+    client: httpx.AsyncClient, mode: str, value: str, cache_key: str
+) -> Optional[Dict[str, Any]]:
+    """Query the resolver for an identifier that missed the cache."""
+
+    return await coalesce(
+        _inflight, cache_key, lambda: _request_resolution(client, mode, value, cache_key)
+    )
+
+
+async def _request_resolution(
+    client: httpx.AsyncClient, mode: str, value: str, cache_key: str
+) -> Optional[Dict[str, Any]]:
     try:
         response = await client.get(f"{LETTERBOXD_RESOLVE_BASE}/{mode}/{value}")
         response.raise_for_status()
@@ -90,14 +141,16 @@ async def resolve_identifier(
         return None
 
     try:
-        payload = response.json()
+        payload = orjson.loads(response.content)
     except ValueError:
         return None
 
-    if not isinstance(payload, list) or len(payload) == 0:
+    if not (isinstance(payload, list) and payload):
         return None
 
     first = payload[0]
+    if not isinstance(first, dict):
+        return None
     result = {
         "slug": first.get("slug"),
         "lbxd": first.get("lbxd"),
@@ -105,8 +158,9 @@ async def resolve_identifier(
         "tmdb": first.get("tmdb"),
     }
 
+    _memory_cache[cache_key] = result
     if resolve_cache:
-        resolve_cache.set(cache_key, result)
+        await asyncio.to_thread(resolve_cache.set, cache_key, result)
 
     return result
 
@@ -119,53 +173,66 @@ async def enrich_catalog_metas(
 ) -> None:
     """Populate imdb_id for Letterboxd entries so TMDB translation can run."""
 
-    indexes: List[Tuple[int, str]] = []
-    tasks: List[asyncio.Task] = []
+    # Filter in one pass; nothing is scheduled until the candidates are known
+    candidates: List[Tuple[int, str, str]] = [
+        (idx, item.get("type", "movie"), item_id)
+        for idx, item in enumerate(metas)
+        if (item_id := item.get("id", "")).startswith("letterboxd:")
+        and not (item.get("imdb_id") or "").startswith("tt")
+    ]
+    if not candidates:
+        return
 
-    for idx, item in enumerate(metas):
-        item_id = item.get("id", "")
-        imdb_id = item.get("imdb_id")
-        if imdb_id and "tt" in imdb_id:
-            continue
-        if not item_id.startswith("letterboxd:"):
+    # Group by cache key so entries repeated across merged lists share one lookup
+    by_key: Dict[str, Tuple[Tuple[str, str, str], List[Tuple[int, str]]]] = {}
+    for idx, item_type, item_id in candidates:
+        parsed = _normalise_identifier(item_id)
+        if not parsed:
             continue
+        group = by_key.get(parsed[2])
+        if group is None:
+            group = by_key[parsed[2]] = (parsed, [])
+        group[1].append((idx, item_type))
 
-        indexes.append((idx, item.get("type", "movie")))
-        tasks.append(asyncio.create_task(resolve_identifier(client, item_id)))
+    # Cache hits are looked up in one batch; only misses are sent to the resolver
+    resolved_by_key: Dict[str, Optional[Dict[str, Any]]] = await _get_cached_resolutions(by_key)
+    misses = [parsed for cache_key, (parsed, _) in by_key.items() if cache_key not in resolved_by_key]
 
-    if not tasks:
-        return
+    if misses:
+        fetched = await asyncio.gather(*(_fetch_resolution(client, *parsed) for parsed in misses))
+        for parsed, resolved in zip(misses, fetched, strict=True):
+            resolved_by_key[parsed[2]] = resolved
 
-    resolved_list = await asyncio.gather(*tasks)
-    to_fetch_from_tmdb: List[Tuple[int, str, str]] = []
+    to_fetch_from_tmdb: Dict[Tuple[str, str], List[int]] = {}
 
-    for (idx, item_type), resolved in zip(indexes, resolved_list):
+    for cache_key, resolved in resolved_by_key.items():
         if not resolved:
             continue
         imdb_id = resolved.get("imdb")
         tmdb_id = resolved.get("tmdb")
+        entries = by_key[cache_key][1]
 
-        if imdb_id and "tt" in imdb_id:
-            metas[idx]["imdb_id"] = imdb_id
+        if imdb_id and imdb_id.startswith("tt"):
+            for idx, _ in entries:
+                metas[idx]["imdb_id"] = imdb_id
             continue
 
         if tmdb_id and tmdb_key:
-            to_fetch_from_tmdb.append((idx, item_type, str(tmdb_id)))
+            for idx, item_type in entries:
+                to_fetch_from_tmdb.setdefault((item_type, str(tmdb_id)), []).append(idx)
 
     if not to_fetch_from_tmdb:
         return
 
-    fetch_tasks = [
-        asyncio.create_task(
-            _fetch_imdb_from_tmdb(client, tmdb_id, item_type, language, tmdb_key)
-        )
-        for (_, item_type, tmdb_id) in to_fetch_from_tmdb
-    ]
+    imdb_values = await asyncio.gather(*(
+        _fetch_imdb_from_tmdb(client, tmdb_id, item_type, language, tmdb_key)
+        for item_type, tmdb_id in to_fetch_from_tmdb
+    ))
 
-    imdb_values = await asyncio.gather(*fetch_tasks)
-
-    for (idx, _, tmdb_id), imdb_value in zip(to_fetch_from_tmdb, imdb_values):
-        if imdb_value and "tt" in imdb_value:
+    for ((_, tmdb_id), idxs), imdb_value in zip(to_fetch_from_tmdb.items(), imdb_values, strict=True):
+        if not (imdb_value and imdb_value.startswith("tt")):
+            continue
+        for idx in idxs:
             metas[idx]["imdb_id"] = imdb_value
             metas[idx]["tmdb_id"] = tmdb_id
 
@@ -177,15 +244,14 @@ async def _fetch_imdb_from_tmdb(
     language: str,
     tmdb_key: str,
 ) -> Optional[str]:
+    # external_ids is a ~100 byte payload and, unlike the series details,
+    # carries imdb_id at the top level for both movies and series
     try:
-        if item_type == "series":
-            details = await tmdb.get_series_details(client, tmdb_id, language, tmdb_key)
-        else:
-            details = await tmdb.get_movie_details(client, tmdb_id, language, tmdb_key)
+        external_ids = await tmdb.get_external_ids(client, tmdb_id, item_type, language, tmdb_key)
     except Exception:
         return None
 
-    return details.get("imdb_id")
+    return external_ids.get("imdb_id")
 
 
 def _normalise_list_input(raw: str) -> Tuple[str, str]:
@@ -213,8 +279,12 @@ def _normalise_list_input(raw: str) -> Tuple[str, str]:
     return url, name
 
 
+@functools.lru_cache(maxsize=4096)
 def _encode_letterboxd_config(url: str, catalog_name: str) -> str:
-    """Mimic stremio-letterboxd config encoding (sorted keys then base64)."""
+    """Mimic stremio-letterboxd config encoding (sorted keys then base64).
+
+    Memoized, since the same lists are requested over and over.
+    """
 
     cfg = {
         "catalogName": catalog_name,
@@ -223,9 +293,14 @@ def _encode_letterboxd_config(url: str, catalog_name: str) -> str:
         "posterChoice": "letterboxd",
         "url": url,
     }
-    sorted_cfg = dict(sorted(cfg.items()))
-    payload = json.dumps(sorted_cfg, separators=(',', ':')).encode()
-    return base64.b64encode(payload).decode()
+    payload = orjson.dumps(cfg, option=orjson.OPT_SORT_KEYS)
+    return base64.b64encode(payload).decode("ascii")
+
+
+# Manifest ids issued by the Letterboxd addon per encoded config
+_manifest_ids: TTLCache = TTLCache(maxsize=1024, ttl=timedelta(hours=6).total_seconds())
+# Raw catalog bodies for hot lists; kept as bytes so every caller parses fresh metas to mutate
+_catalog_bodies: TTLCache = TTLCache(maxsize=256, ttl=timedelta(minutes=2).total_seconds())
 
 
 async def _fetch_letterboxd_catalog(
@@ -235,39 +310,56 @@ async def _fetch_letterboxd_catalog(
 
     config_string = _encode_letterboxd_config(url, catalog_name)
 
-    # Obtain manifest id
-    resp = await client.post(f"{LETTERBOXD_ADDON_BASE}/api/config/{config_string}")
-    if resp.status_code != 200:
-        print(f"[lb_multi] config fetch failed {resp.status_code} url={url} name={catalog_name}")
-        return []
-
-    manifest_id = resp.json().get("id")
-    if not manifest_id:
-        print(f"[lb_multi] missing manifest id for url={url}")
-        return []
+    body = _catalog_bodies.get(config_string)
+    if body is not None:
+        return orjson.loads(body).get("metas", [])
+
+    # Obtain manifest id; the config round trip is skipped while a previous id is cached
+    manifest_id = _manifest_ids.get(config_string)
+    if manifest_id is None:
+        resp = await client.post(f"{LETTERBOXD_ADDON_BASE}/api/config/{config_string}")
+        if resp.status_code != 200:
+            logger.warning(
+                "[lb_multi] config fetch failed %s url=%s name=%s", resp.status_code, url, catalog_name
+            )
+            return []
+
+        manifest_id = orjson.loads(resp.content).get("id")
+        if not manifest_id:
+            logger.warning("[lb_multi] missing manifest id for url=%s", url)
+            return []
+        _manifest_ids[config_string] = manifest_id
 
     catalog_resp = await client.get(
         f"{LETTERBOXD_ADDON_BASE}/{manifest_id}/catalog/letterboxd/{config_string}.json"
     )
 
+    if catalog_resp.status_code != 200:
+        # The id may have been dropped upstream; register the config again next time
+        _manifest_ids.pop(config_string, None)
+
     try:
-        catalog = catalog_resp.json()
+        catalog = orjson.loads(catalog_resp.content)
     except Exception:
-        print(f"[lb_multi] catalog parse failed status={catalog_resp.status_code} url={url}")
+        logger.warning(
+            "[lb_multi] catalog parse failed status=%s url=%s", catalog_resp.status_code, url
+        )
         return []
 
+    if catalog_resp.status_code == 200:
+        _catalog_bodies[config_string] = catalog_resp.content
     return catalog.get("metas", [])
 
 
-def _dedupe_metas(metas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    seen: Dict[str, Dict[str, Any]] = {}
+def _dedupe_metas(metas: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    seen = set()
+    out: List[Dict[str, Any]] = []
     for meta in metas:
         key = meta.get("imdb_id") or meta.get("id")
-        if not key:
-            continue
-        if key not in seen:
-            seen[key] = meta
-    return list(seen.values())
+        if key and key not in seen:
+            seen.add(key)
+            out.append(meta)
+    return out
 
 
 async def fetch_multi_list_catalog(
@@ -275,7 +367,7 @@ async def fetch_multi_list_catalog(
 ) -> Dict[str, Any]:
     """Fetch and merge multiple Letterboxd lists/watchlists into one catalog."""
 
-    print(f"[lb_multi] fetch start count={len(slugs)} slugs={slugs}")
+    logger.debug("[lb_multi] fetch start count=%d slugs=%s", len(slugs), slugs)
     tasks = []
     for slug in slugs:
         url, catalog_name = _normalise_list_input(slug)
@@ -283,9 +375,7 @@ async def fetch_multi_list_catalog(
 
     results = await asyncio.gather(*tasks)
 
-    combined: List[Dict[str, Any]] = []
-    for metas in results:
-        combined.extend(metas)
-
-    print(f"[lb_multi] combined metas={len(combined)}")
-    return {"metas": _dedupe_metas(combined)}
+    # Dedupe straight off the per-list results instead of concatenating them first
+    combined = _dedupe_metas(itertools.chain.from_iterable(results))
+    logger.debug("[lb_multi] combined metas=%d", len(combined))
+    return {"metas": combined}
@@ -0,0 +1,16 @@
+from fastapi.responses import ORJSONResponse, Response
+
+from src.translator_app.constants import cloudflare_cache_raw_headers
+
+
+def json_response(content, raw_headers: tuple = cloudflare_cache_raw_headers) -> ORJSONResponse:
+    """ORJSONResponse with a pre-encoded header set appended, skipping per-request header encoding."""
+    response = ORJSONResponse(content=content)
+    response.raw_headers.extend(raw_headers)
+    return response
+
+def json_bytes_response(body: bytes, raw_headers: tuple = cloudflare_cache_raw_headers) -> Response:
+    """Response for an already serialized JSON body, with the same pre-encoded headers."""
+    response = Response(content=body, media_type="application/json")
+    response.raw_headers.extend(raw_headers)
+    return response
@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Response, HTTPException
-from fastapi.responses import JSONResponse
 import httpx
 import asyncio
+import orjson
 import logging
-import json
+import re
+import hashlib
 from src.translator_app.settings import settings
-from src.translator_app.constants import cloudflare_cache_headers
-from src.translator_app.utils import normalize_addon_url, decode_base64_url, parse_user_settings
+from src.translator_app.http_client import get_http_client
+from src.translator_app.constants import catalog_cache_raw_headers
+from src.translator_app.responses import json_response
+from src.translator_app.cache_manager import get_catalog_cache
+from src.translator_app.utils import normalize_addon_url, decode_addon_url, parse_user_settings
 from src.translator_app.services.anime_utils import remove_duplicates
 from src.translator_app.api import tmdb
 from src.translator_app.providers import letterboxd
@@ -15,6 +19,9 @@ from src.translator_app import translator
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# Accept | ; , and newline as lb_multi separators
+_LB_SEP_RE = re.compile(r'[|;,\n]+')
+
 @router.get(
     "/{addon_url}/{user_settings}/catalog/{type}/{path:path}",
     summary="Get Translated Addon Catalog",
@@ -26,8 +33,17 @@ logger = logging.getLogger(__name__)
     },
 )
 async def get_catalog(response: Response, addon_url: str, type: str, user_settings: str, path: str):
+    # Convert addon base64 url (fallback to raw if already plain)
+    try:
+        addon_url = decode_addon_url(addon_url)
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Failed to decode addon_url '{addon_url}', treating as plain URL. Error: {e}")
+        addon_url = normalize_addon_url(addon_url)
+
+    return await _get_catalog_impl(parse_user_settings(user_settings), addon_url, type, path)
+
+async def _get_catalog_impl(settings_dict: dict, addon_url: str, type: str, path: str):
     # User settings
-    settings_dict = parse_user_settings(user_settings)
     language = settings_dict.get('language') or settings.default_language
     if language not in tmdb.tmp_cache:
         language = settings.default_language
@@ -39,91 +55,88 @@ async def get_catalog(response: Response, addon_url: str, type: str, user_settin
     top_stream_key = settings_dict.get('topkey', '')
     lb_multi = settings_dict.get('lb_multi', '')
 
-    # Convert addon base64 url (fallback to raw if already plain)
-    try:
-        addon_url = normalize_addon_url(decode_base64_url(addon_url))
-    except (ValueError, TypeError) as e:
-        logger.warning(f"Failed to decode addon_url '{addon_url}', treating as plain URL. Error: {e}")
-        addon_url = normalize_addon_url(addon_url)
+    # Serve repeated browsing requests from the short-lived output cache
+    cache_key = hashlib.blake2b(
+        f"{addon_url}|{type}|{path}|{language}|{tmdb_key}|{rpdb}|{rpdb_key}|{toast_ratings}|{top_stream_poster}|{top_stream_key}|{lb_multi}".encode(),
+        digest_size=16
+    ).hexdigest()
+    catalog_cache = get_catalog_cache()
+    cached = catalog_cache.get(cache_key)
+    if cached is not None:
+        return json_response(cached, catalog_cache_raw_headers)
+
+    client = get_http_client()
+    if addon_url == 'letterboxd-multi' or lb_multi:
+        inputs = [token for token in (t.strip() for t in _LB_SEP_RE.split(lb_multi)) if token]
+
+        logger.info(f"[lb_multi] raw='{lb_multi}' parsed={inputs}")
+        catalog = await letterboxd.fetch_multi_list_catalog(get_http_client("letterboxd"), inputs)
+    else:
+        try:
+            response = await client.get(f"{addon_url}/catalog/{type}/{path}")
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Upstream addon error for {addon_url}: {e}")
+            raise HTTPException(status_code=e.response.status_code, detail=f"Upstream addon error: {e.response.text}")
+        except httpx.RequestError as e:
+            logger.error(f"Upstream addon request failed for {addon_url}: {e}")
+            raise HTTPException(status_code=502, detail=f"Failed to request upstream addon: {e}")
+
+        # Cinemeta last-videos and calendar
+        if 'last-videos' in path or 'calendar-videos' in path:
+            return json_response(orjson.loads(response.content))
 
-    async with httpx.AsyncClient(follow_redirects=True, timeout=settings.request_timeout) as client:
-        if addon_url == 'letterboxd-multi' or lb_multi:
-            inputs = []
-            # Accept | ; , and newline as separators
-            for token in lb_multi.replace('\n', '|').replace(';', '|').replace(',', '|').split('|'):
-                token = token.strip()
-                if not token:
-                    continue
-                inputs.append(token)
-
-            logger.info(f"[lb_multi] raw='{lb_multi}' parsed={inputs}")
-            catalog = await letterboxd.fetch_multi_list_catalog(client, inputs)
-        else:
-            try:
-                response = await client.get(f"{addon_url}/catalog/{type}/{path}")
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Upstream addon error for {addon_url}: {e}")
-                raise HTTPException(status_code=e.response.status_code, detail=f"Upstream addon error: {e.response.text}")
-            except httpx.RequestError as e:
-                logger.error(f"Upstream addon request failed for {addon_url}: {e}")
-                raise HTTPException(status_code=502, detail=f"Failed to request upstream addon: {e}")
-
-            # Cinemeta last-videos and calendar
-            if 'last-videos' in path or 'calendar-videos' in path:
-                return JSONResponse(content=response.json(), headers=cloudflare_cache_headers)
-            
-            try:
-                catalog = response.json()
-            except json.JSONDecodeError as e:
-                logger.error(f"Error decoding JSON from catalog: {response.status_code} - {e.doc}")
-                return JSONResponse(content={}, headers=cloudflare_cache_headers)
-            
-            if type == 'anime':
-                await remove_duplicates(catalog)
-
-        if 'metas' in catalog:
-            # Drop any malformed entries before processing
-            metas = catalog.get('metas') or []
-            original_count = len(metas)
-            catalog['metas'] = [m for m in metas if isinstance(m, dict)]
-            if original_count != len(catalog['metas']):
-                logger.warning(f"Filtered {original_count - len(catalog['metas'])} invalid metas from catalog")
-
-            has_letterboxd = any(
-                (meta.get('id') or '').startswith('letterboxd:') or (meta.get('imdb_id') or '').startswith('letterboxd:')
-                for meta in catalog['metas']
-            )
-
-            if has_letterboxd:
-                await letterboxd.enrich_catalog_metas(client, catalog['metas'], tmdb_key, language)
-
-            tasks = []
-            for item in catalog['metas']:
-                id = item.get('imdb_id', item.get('id'))
-                if not id:
-                    tasks.append(asyncio.sleep(0, result={}))
-                    continue
-
-                cached = tmdb.tmp_cache[language].get(id)
-
-                if cached:
-                    tasks.append(asyncio.sleep(0, result=cached))
-                else:
-                    if type == 'anime':
-                        if item.get("animeType") in ("TV", "movie"):
-                            tasks.append(tmdb.get_tmdb_data(client, id, "imdb_id", language, tmdb_key))
-                        else:
-                            tasks.append(asyncio.sleep(0, result={}))
-                    else:
-                        tasks.append(tmdb.get_tmdb_data(client, id, "imdb_id", language, tmdb_key))
-
-            tmdb_details = await asyncio.gather(*tasks)
-        else:
-            return JSONResponse(content={}, headers=cloudflare_cache_headers)
+        try:
+            catalog = orjson.loads(response.content)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Error decoding JSON from catalog: {response.status_code} - {e.doc}")
+            return json_response({})
+
+        if type == 'anime':
+            await remove_duplicates(catalog)
+
+    if 'metas' in catalog:
+        # Drop any malformed entries before processing
+        metas = catalog.get('metas') or []
+        original_count = len(metas)
+        catalog['metas'] = [m for m in metas if isinstance(m, dict)]
+        if original_count != len(catalog['metas']):
+            logger.warning(f"Filtered {original_count - len(catalog['metas'])} invalid metas from catalog")
+
+        has_letterboxd = any(
+            (meta.get('id') or '').startswith('letterboxd:') or (meta.get('imdb_id') or '').startswith('letterboxd:')
+            for meta in catalog['metas']
+        )
+
+        if has_letterboxd:
+            await letterboxd.enrich_catalog_metas(client, catalog['metas'], tmdb_key, language)
+
+        # Fill cache hits directly and only gather the misses; fetch_and_retry
+        # already bounds concurrency per TMDB key
+        tmdb_details = [{}] * len(catalog['metas'])
+        miss_idx, miss_tasks = [], []
+        tmdb_cache = tmdb.tmp_cache[language]
+        for i, item in enumerate(catalog['metas']):
+            id = item.get('imdb_id', item.get('id'))
+            if not id:
+                continue
+
+            cached = tmdb_cache.get(id)
+
+            if cached:
+                tmdb_details[i] = cached
+            elif type != 'anime' or item.get("animeType") in ("TV", "movie"):
+                miss_idx.append(i)
+                miss_tasks.append(tmdb.get_tmdb_data(client, id, "imdb_id", language, tmdb_key))
+
+        for i, details in zip(miss_idx, await asyncio.gather(*miss_tasks), strict=True):
+            tmdb_details[i] = details
+    else:
+        return json_response({})
 
     new_catalog = translator.translate_catalog(catalog, tmdb_details, top_stream_poster, toast_ratings, rpdb, rpdb_key, top_stream_key, language)
-    return JSONResponse(content=new_catalog, headers=cloudflare_cache_headers)
+    catalog_cache.set(cache_key, new_catalog)
+    return json_response(new_catalog, catalog_cache_raw_headers)
 
 @router.get(
     "/letterboxd-multi/catalog/{type}/{path:path}",
@@ -146,9 +159,7 @@ async def letterboxd_multi_catalog(type: str, path: str, tmdb_key: str, language
         'topkey': topkey,
         'lb_multi': lb_multi
     }
-    # Re-use existing logic by formatting settings into the legacy string
-    settings_str = ','.join([f"{k}={v}" for k, v in user_settings.items()])
-    return await get_catalog(Response(), 'letterboxd-multi', type, settings_str, path)
+    return await _get_catalog_impl(user_settings, 'letterboxd-multi', type, path)
 
 @router.get(
     '/{addon_url}/{user_settings}/addon_catalog/{path:path}',
@@ -161,18 +172,18 @@ async def letterboxd_multi_catalog(type: str, path: str, tmdb_key: str, language
     },
 )
 async def get_addon_catalog(addon_url: str, path: str):
-    addon_url = normalize_addon_url(decode_base64_url(addon_url))
-    async with httpx.AsyncClient(follow_redirects=True, timeout=settings.request_timeout) as client:
-        try:
-            response = await client.get(f"{addon_url}/addon_catalog/{path}")
-            response.raise_for_status()
-            return JSONResponse(content=response.json(), headers=cloudflare_cache_headers)
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Upstream addon error for {addon_url}: {e}")
-            raise HTTPException(status_code=e.response.status_code, detail=f"Upstream addon error: {e.response.text}")
-        except httpx.RequestError as e:
-            logger.error(f"Upstream addon request failed for {addon_url}: {e}")
-            raise HTTPException(status_code=502, detail=f"Failed to request upstream addon: {e}")
-        except json.JSONDecodeError as e:
-            logger.error(f"Error decoding JSON from addon_catalog: {e.doc}")
-            raise HTTPException(status_code=500, detail="Failed to decode JSON from upstream addon.")
+    addon_url = decode_addon_url(addon_url)
+    client = get_http_client()
+    try:
+        response = await client.get(f"{addon_url}/addon_catalog/{path}")
+        response.raise_for_status()
+        return json_response(orjson.loads(response.content))
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Upstream addon error for {addon_url}: {e}")
+        raise HTTPException(status_code=e.response.status_code, detail=f"Upstream addon error: {e.response.text}")
+    except httpx.RequestError as e:
+        logger.error(f"Upstream addon request failed for {addon_url}: {e}")
+        raise HTTPException(status_code=502, detail=f"Failed to request upstream addon: {e}")
+    except orjson.JSONDecodeError as e:
+        logger.error(f"Error decoding JSON from addon_catalog: {e.doc}")
+        raise HTTPException(status_code=500, detail="Failed to decode JSON from upstream addon.")
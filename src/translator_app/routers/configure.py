@@ -2,7 +2,7 @@ from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse, RedirectResponse
 from src.translator_app.templates import templates
 from src.translator_app.constants import cloudflare_cache_headers
-from src.translator_app.utils import normalize_addon_url, decode_base64_url
+from src.translator_app.utils import decode_addon_url
 
 router = APIRouter()
 
@@ -15,7 +15,7 @@ async def home(request: Request):
 
 @router.get('/{addon_url}/{user_settings}/configure')
 async def configure(addon_url: str):
-    addon_url = normalize_addon_url(decode_base64_url(addon_url)) + '/configure'
+    addon_url = decode_addon_url(addon_url) + '/configure'
     return RedirectResponse(addon_url)
 
 @router.get('/link_generator', response_class=HTMLResponse)
@@ -1,26 +1,37 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 import httpx
-import json
+import copy
+import orjson
 import asyncio
+from pathlib import Path
 from src.translator_app import translator
 from src.translator_app.settings import settings
+from src.translator_app.http_client import get_http_client
 from src.translator_app.constants import cloudflare_cache_headers
-from src.translator_app.utils import normalize_addon_url, decode_base64_url, parse_user_settings, sanitize_alias
+from src.translator_app.responses import json_response
+from src.translator_app.utils import decode_addon_url, parse_user_settings, sanitize_alias
 
 router = APIRouter()
 
+# The addon manifest never changes at runtime; parse it once. Resolve it from the
+# repository root rather than the working directory so imports work from anywhere.
+_MANIFEST_PATH = Path(__file__).resolve().parents[3] / "manifest.json"
+with open(_MANIFEST_PATH, "rb") as f:
+    _BASE_MANIFEST = orjson.loads(f.read())
+_BASE_MANIFEST_BYTES = orjson.dumps(_BASE_MANIFEST)
+
 async def _get_upstream_manifest(addon_url: str) -> dict:
     """Fetches the manifest from the upstream addon URL."""
-    async with httpx.AsyncClient(timeout=settings.request_timeout) as client:
-        try:
-            response = await client.get(f"{addon_url}/manifest.json")
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPStatusError as e:
-            raise HTTPException(status_code=502, detail=f"Upstream manifest fetch failed ({e.response.status_code})")
-        except (json.JSONDecodeError, TypeError):
-            raise HTTPException(status_code=502, detail="Upstream manifest is not valid JSON.")
+    client = get_http_client()
+    try:
+        response = await client.get(f"{addon_url}/manifest.json")
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(status_code=502, detail=f"Upstream manifest fetch failed ({e.response.status_code})")
+    except (orjson.JSONDecodeError, TypeError):
+        raise HTTPException(status_code=502, detail="Upstream manifest is not valid JSON.")
 
 async def _translate_manifest_content(manifest: dict, language: str):
     """Translates the content of the manifest."""
@@ -33,11 +44,11 @@ async def _translate_manifest_content(manifest: dict, language: str):
     manifest['description'] = f"{manifest.get('description', '')} | Translated by Toast Translator. {settings.translator_version}"
 
     if settings.translate_catalog_name:
-        async with httpx.AsyncClient(timeout=settings.request_timeout) as client:
-            tasks = [translator.translate_with_api(client, catalog['name'], language) for catalog in manifest.get('catalogs', [])]
-            translations = await asyncio.gather(*tasks)
-            for i, catalog in enumerate(manifest.get('catalogs', [])):
-                catalog['name'] = translations[i]
+        client = get_http_client()
+        tasks = [translator.translate_with_api(client, catalog['name'], language) for catalog in manifest.get('catalogs', [])]
+        translations = await asyncio.gather(*tasks)
+        for i, catalog in enumerate(manifest.get('catalogs', [])):
+            catalog['name'] = translations[i]
 
 def _apply_manifest_overrides(manifest: dict):
     """Applies settings-based overrides to the manifest."""
@@ -60,9 +71,7 @@ def _customize_manifest(manifest: dict, alias: str):
 
 @router.get("/manifest.json")
 async def get_manifest():
-    with open("manifest.json", "r", encoding="utf-8") as f:
-        manifest = json.load(f)
-    return JSONResponse(content=manifest, headers=cloudflare_cache_headers)
+    return Response(content=_BASE_MANIFEST_BYTES, media_type="application/json", headers=cloudflare_cache_headers)
 
 @router.get("/letterboxd-multi/{user_settings}/manifest.json")
 async def letterboxd_multi_manifest(user_settings: str):
@@ -70,9 +79,8 @@ async def letterboxd_multi_manifest(user_settings: str):
     language = settings_dict.get('language', 'bg-BG')
     alias = sanitize_alias(settings_dict.get('alias', ''))
     
-    with open("manifest.json", "r", encoding="utf-8") as f:
-        manifest = json.load(f)
-        
+    manifest = copy.deepcopy(_BASE_MANIFEST)
+
     manifest['translated'] = True
     manifest['t_language'] = language
     manifest['name'] += f" {translator.LANGUAGE_FLAGS.get(language, '')}"
@@ -87,11 +95,11 @@ async def letterboxd_multi_manifest(user_settings: str):
         "name": "Letterboxd Multi",
         "extra": []
     }]
-    return JSONResponse(content=manifest, headers=cloudflare_cache_headers)
+    return json_response(manifest)
 
 @router.get('/{addon_url}/{user_settings}/manifest.json')
 async def get_manifest_proxy(addon_url: str, user_settings: str):
-    addon_url = normalize_addon_url(decode_base64_url(addon_url))
+    addon_url = decode_addon_url(addon_url)
     user_settings_dict = parse_user_settings(user_settings)
     alias = sanitize_alias(user_settings_dict.get('alias', ''))
     language = user_settings_dict.get('language') or settings.default_language
@@ -107,4 +115,4 @@ async def get_manifest_proxy(addon_url: str, user_settings: str):
     
     _customize_manifest(manifest, alias)
 
-    return JSONResponse(content=manifest, headers=cloudflare_cache_headers)
+    return json_response(manifest)
@@ -1,13 +1,25 @@
 from fastapi import APIRouter, Request, Response
-from fastapi.responses import JSONResponse
+from typing import Dict
+import asyncio
 import httpx
-from src.translator_app.settings import settings
+import orjson
+from src.translator_app.http_client import get_http_client
 from src.translator_app.constants import cloudflare_cache_headers
-from src.translator_app.utils import normalize_addon_url, decode_base64_url
+from src.translator_app.responses import json_response
+from src.translator_app.coalesce import coalesce
+from src.translator_app.utils import decode_addon_url
 from src.translator_app.services.stream_enricher import enrich_streams_with_subtitles
 
 router = APIRouter()
 
+# Upstream stream fetches in flight; concurrent identical requests (a burst of clients
+# opening the same episode) share one upstream call
+_upstream_inflight: Dict[tuple, asyncio.Task] = {}
+
+async def _fetch_upstream_streams(url: str, query: dict) -> httpx.Response:
+    key = (url, tuple(sorted(query.items())))
+    return await coalesce(_upstream_inflight, key, lambda: get_http_client().get(url, params=query))
+
 @router.get('/{addon_url}/{user_settings}/stream/{path:path}', response_model=None)
 async def get_stream(
     addon_url: str, 
@@ -24,12 +36,12 @@ async def get_stream(
         request: FastAPI request object
         
     Returns:
-        JSONResponse with enriched stream data or error Response
+        JSON response with enriched stream data or error Response
     """
     from src.translator_app.utils import parse_user_settings
     from src.translator_app.logger import logger
     
-    addon_url = normalize_addon_url(decode_base64_url(addon_url))
+    addon_url = decode_addon_url(addon_url)
     query = dict(request.query_params)
     
     # Parse user settings for enrich level
@@ -45,14 +57,13 @@ async def get_stream(
     except (ValueError, TypeError) as e:
         logger.debug(f"Failed to parse enrich level: {e}")
     
-    async with httpx.AsyncClient(follow_redirects=True, timeout=settings.request_timeout) as client:
-        upstream = await client.get(f"{addon_url}/stream/{path}", params=query)
+    upstream = await _fetch_upstream_streams(f"{addon_url}/stream/{path}", query)
 
     if upstream.status_code >= 400:
         return Response(status_code=upstream.status_code, content=upstream.content, headers=cloudflare_cache_headers)
 
     try:
-        payload = upstream.json()
+        payload = orjson.loads(upstream.content)
     except Exception:
         # Fallback to raw response if upstream is not JSON
         return Response(status_code=upstream.status_code, content=upstream.content, headers=cloudflare_cache_headers, media_type=upstream.headers.get("content-type"))
@@ -78,4 +89,4 @@ async def get_stream(
             streams, media_type, item_id, request_base, enrich_level
         )
 
-    return JSONResponse(content=payload, headers=cloudflare_cache_headers)
+    return json_response(payload)
@@ -1,26 +1,36 @@
-from fastapi import APIRouter, Request, Response
-from fastapi.responses import RedirectResponse
-import httpx
-from src.translator_app.settings import settings
-from src.translator_app.utils import normalize_addon_url, decode_base64_url
+from fastapi import APIRouter, Request
+from fastapi.responses import RedirectResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from src.translator_app.http_client import get_http_client
+from src.translator_app.utils import decode_addon_url
 
 router = APIRouter()
 
+# Header names as lowercase bytes. ASGI request headers are already lowercase, but httpx keeps
+# the upstream's original casing in raw response headers, so those are lowered before the check.
+# The body is piped through undecoded, so content-encoding is kept for the client.
+_PROXY_REQUEST_EXCLUDED = frozenset({b"host"})
+_PROXY_RESPONSE_EXCLUDED = frozenset({b"transfer-encoding", b"connection"})
+
 @router.api_route('/subs', methods=['GET'])
 @router.api_route('/subs/{path:path}', methods=['GET', 'POST'])
 async def proxy_subtitles(request: Request, path: str = ""):
-    target_url = f"{settings.subs_proxy_base}/{path}".rstrip("/")
-    headers = dict(request.headers)
-    headers.pop("host", None)
+    target_path = f"/{path}".rstrip("/")
+    headers = [(k, v) for k, v in request.headers.raw if k not in _PROXY_REQUEST_EXCLUDED]
     data = await request.body()
     params = dict(request.query_params)
-    async with httpx.AsyncClient(follow_redirects=True, timeout=settings.request_timeout) as client:
-        upstream = await client.request(request.method, target_url, params=params, content=data, headers=headers)
-    excluded = {"content-encoding", "transfer-encoding", "connection"}
-    resp_headers = {k: v for k, v in upstream.headers.items() if k.lower() not in excluded}
-    return Response(content=upstream.content, status_code=upstream.status_code, headers=resp_headers)
+    client = get_http_client("subs")
+    upstream_request = client.build_request(request.method, target_path, params=params, content=data, headers=headers)
+    upstream = await client.send(upstream_request, stream=True)
+    response = StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        background=BackgroundTask(upstream.aclose),
+    )
+    response.raw_headers = [(k, v) for k, v in upstream.headers.raw if k.lower() not in _PROXY_RESPONSE_EXCLUDED]
+    return response
 
 @router.get('/{addon_url}/{user_settings}/subtitles/{path:path}')
 async def get_subs(addon_url: str, path: str):
-    addon_url = normalize_addon_url(decode_base64_url(addon_url))
+    addon_url = decode_addon_url(addon_url)
     return RedirectResponse(f"{addon_url}/subtitles/{path}")
@@ -1,35 +1,59 @@
+import asyncio
 from src.translator_app.anime import kitsu, mal
 
 async def remove_duplicates(catalog) -> None:
-    unique_items = []
     seen_ids = set()
-    
-    for item in catalog.get('metas') or []:
-        if not isinstance(item, dict):
-            continue
+    metas = catalog.get('metas') or []
+    items = [item for item in metas if isinstance(item, dict) and item.get('id')]
+
+    # Only TV entries are collapsed into seasons; without any, skip the dedup bookkeeping.
+    # Ids are still converted because the TMDB lookup in get_catalog relies on imdb_id.
+    has_tv = any(item.get('animeType') == 'TV' for item in items)
+
+    # Convert all kitsu / mal ids up front, one batch per source
+    kitsu_ids = [(item['id'], item.get('type')) for item in items if 'kitsu' in item['id']]
+    mal_ids = [(item['id'].replace('_',':'), item.get('type')) for item in items if 'kitsu' not in item['id'] and 'mal_' in item['id']]
+    kitsu_map, mal_map = await asyncio.gather(
+        kitsu.convert_to_imdb_many(kitsu_ids),
+        mal.convert_to_imdb_many(mal_ids)
+    )
 
-        item_id = item.get('id')
-        if not item_id:
+    # Compact metas in place: kept items are moved down to the write index
+    write = 0
+    for item in metas:
+        if not isinstance(item, dict) or not item.get('id'):
             continue
+        item_id = item['id']
 
         # Get imdb id and animetype from catalog data
         anime_type = item.get('animeType', None)
         imdb_id = None
         if 'kitsu' in item_id:
-            imdb_id, is_converted = await kitsu.convert_to_imdb(item_id, item.get('type'))
+            imdb_id = kitsu_map.get(item_id)
         elif 'mal_' in item_id:
-            imdb_id, is_converted = await mal.convert_to_imdb(item_id.replace('_',':'), item.get('type'))
+            imdb_id = mal_map.get(item_id.replace('_',':'))
         elif 'tt' in item_id:
             imdb_id = item_id
         item['imdb_id'] = imdb_id
 
+        if not has_tv:
+            keep = True
+
         # Add special, ona, ova, movies
-        if imdb_id == None or anime_type != 'TV':
-            unique_items.append(item)
+        elif imdb_id is None or anime_type != 'TV':
+            keep = True
 
         # Incorporate seasons
         elif imdb_id not in seen_ids:
-            unique_items.append(item)
+            keep = True
             seen_ids.add(imdb_id)
 
-    catalog['metas'] = unique_items
+        else:
+            keep = False
+
+        if keep:
+            metas[write] = item
+            write += 1
+
+    del metas[write:]
+    catalog['metas'] = metas
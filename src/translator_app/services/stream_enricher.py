@@ -1,21 +1,94 @@
 import httpx
 import asyncio
+import re
 import time
+import random
 from typing import List, Optional, Dict
 from src.translator_app.settings import settings
+from src.translator_app.http_client import get_http_client
 from src.translator_app.logger import logger
 from src.translator_app.constants import (
     BULGARIAN_FLAG,
+    DISC_ICON,
+    AUDIO_ICON,
     ENRICH_LEVEL_DISABLED,
     ENRICH_LEVEL_SCRAPER_ONLY,
     ENRICH_LEVEL_FULL_PROBE
 )
 from src.translator_app import stream_probe
 
+# BG language detection: ISO 639-1 "bg", 639-2 "bul" and "bulgarian" all share these prefixes
+_BG_LANG_PREFIXES = ("bg", "bul")
+_BG_AUDIO_KEYWORDS = (
+    "bg audio", "bgaudio", "bg-audio",
+    "bg dub", "bgdub", "bg-dub",
+    "бг аудио", "бг дублаж",
+    "bulgarian audio", "bulgarian dub",
+    # Audio codec patterns (common in BG releases)
+    "bg aac", "bg ac3", "bg dd", "bg dts",
+    "bg 5 1", "bg 2 0",  # Channel configs
+)
+# All keywords in one case-insensitive alternation; a space in a keyword also matches a run
+# of "._-" separators, so names are scanned once without lowering or normalizing copies
+_BG_AUDIO_RE = re.compile(
+    "|".join(re.escape(k).replace(r"\ ", r"(?: |[._\-]+)") for k in _BG_AUDIO_KEYWORDS),
+    re.IGNORECASE,
+)
+
+
+# Name prefixes per (bg subs, bg audio) combination
+_FLAG_PREFIXES = {
+    (True, False): BULGARIAN_FLAG,
+    (False, True): AUDIO_ICON,
+    (True, True): f"{BULGARIAN_FLAG} {AUDIO_ICON}",
+}
+
+
+def _strip_flags(name: str) -> str:
+    return name.replace(BULGARIAN_FLAG, "").replace(AUDIO_ICON, "").replace(DISC_ICON, "").strip()
+
+
+def _is_bg_lang(lang: str) -> bool:
+    """Check a normalized (stripped, lowercased) language code or name."""
+    return lang.startswith(_BG_LANG_PREFIXES)
+
+
+def _subtitle_langs_has_bg(raw_langs) -> bool:
+    # Generators, so the scan stops at the first BG entry without normalizing the rest
+    if isinstance(raw_langs, str):
+        return any(_is_bg_lang(lang.strip().lower()) for lang in raw_langs.split(",") if lang)
+    if isinstance(raw_langs, list):
+        return any(_is_bg_lang(str(lang).strip().lower()) for lang in raw_langs if lang)
+    return False
+
+
+# Prioritize streams: 
+# 1) BG Audio (Rare & High Value)
+# 2) BG Embedded Subs
+# 3) BG Found (but not embedded)
+# 4) Everything else
+def _priority(stream: dict) -> int:
+    tags = stream.get("visualTags") or []
+    if "bg-audio" in tags:
+        return 0  # 1. BG Audio (Top Priority)
+    if "bg-embedded" in tags:
+        return 1  # 2. BG Embedded Subs
+
+    # Check for any indication of BG subs (scraped, metadata, or embedded list);
+    # subtitleLangs is only parsed when the cheaper flags are absent
+    if (
+        stream.get("subs_bg")
+        or ("bg-subs" in tags)
+        or _subtitle_langs_has_bg(stream.get("subtitleLangs"))
+    ):
+        return 2  # 3. BG Found (but not embedded)
+    return 3      # 4. Everything else
+
+
 async def _rd_unrestrict(client: httpx.AsyncClient, link: str) -> Optional[str]:
     try:
         resp = await client.post(
-            "https://api.real-debrid.com/rest/1.0/unrestrict/link",
+            "/unrestrict/link",
             data={"link": link},
             headers={"Authorization": f"Bearer {settings.effective_rd_token}"},
             timeout=settings.request_timeout,
@@ -31,7 +104,7 @@ async def _rd_unrestrict(client: httpx.AsyncClient, link: str) -> Optional[str]:
 async def _rd_poll_info(client: httpx.AsyncClient, torrent_id: str) -> Optional[Dict]:
     try:
         resp = await client.get(
-            f"https://api.real-debrid.com/rest/1.0/torrents/info/{torrent_id}",
+            f"/torrents/info/{torrent_id}",
             headers={"Authorization": f"Bearer {settings.effective_rd_token}"},
             timeout=settings.request_timeout,
         )
@@ -45,7 +118,7 @@ async def _rd_poll_info(client: httpx.AsyncClient, torrent_id: str) -> Optional[
 async def _rd_select_file(client: httpx.AsyncClient, torrent_id: str, file_idx: int) -> None:
     try:
         await client.post(
-            f"https://api.real-debrid.com/rest/1.0/torrents/selectFiles/{torrent_id}",
+            f"/torrents/selectFiles/{torrent_id}",
             data={"files": str(file_idx)},
             headers={"Authorization": f"Bearer {settings.effective_rd_token}"},
             timeout=settings.request_timeout,
@@ -54,50 +127,83 @@ async def _rd_select_file(client: httpx.AsyncClient, torrent_id: str, file_idx:
         return
 
 
+# Real-Debrid health: after RD itself fails (429, 5xx, transport errors), skip RD until
+# the cooldown passes. A 4xx for one magnet says nothing about RD and only fails that stream.
+# The cooldown is smudged so workers do not all retry the moment RD recovers.
+_rd_state = {"cooldown": 0.0}
+# Caps concurrent magnet resolutions so a large stream list stays under RD's rate limit
+_rd_sem = asyncio.Semaphore(max(1, settings.rd_concurrency))
+
+
+def _rd_mark_failed() -> None:
+    _rd_state["cooldown"] = time.monotonic() + random.uniform(25, 35)
+
+
 async def _resolve_with_rd(info_hash: str, file_idx: Optional[int]) -> Optional[str]:
     if not settings.effective_rd_token:
         return None
+    if time.monotonic() < _rd_state["cooldown"]:
+        return None
     magnet = f"magnet:?xt=urn:btih:{info_hash}"
     try:
-        async with httpx.AsyncClient(timeout=settings.request_timeout) as client:
-            # Add magnet
-            add_resp = await client.post(
-                "https://api.real-debrid.com/rest/1.0/torrents/addMagnet",
-                data={"magnet": magnet},
-                headers={"Authorization": f"Bearer {settings.effective_rd_token}"},
-            )
-            if add_resp.status_code >= 400:
-                return None
-            torrent_id = add_resp.json().get("id")
-            if not torrent_id:
-                return None
-
-            # Select desired file if provided
-            if file_idx is not None:
-                await _rd_select_file(client, torrent_id, file_idx)
-
-            # Poll for availability and links
-            deadline = time.time() + settings.rd_poll_max_seconds
-            links: List[str] = []
-            while time.time() < deadline:
+        client = get_http_client("rd")
+        # Add magnet
+        add_resp = await client.post(
+            "/torrents/addMagnet",
+            data={"magnet": magnet},
+            headers={"Authorization": f"Bearer {settings.effective_rd_token}"},
+        )
+        if add_resp.status_code == 429 or add_resp.status_code >= 500:
+            _rd_mark_failed()
+            return None
+        if add_resp.status_code >= 400:
+            return None
+        torrent_id = add_resp.json().get("id")
+        if not torrent_id:
+            return None
+
+        # Select desired file if provided; RD queues the selection server-side,
+        # so the first info poll goes out without waiting for it
+        select_task = None
+        if file_idx is not None:
+            select_task = asyncio.create_task(_rd_select_file(client, torrent_id, file_idx))
+
+        # Poll for availability and links. RD has no long-poll endpoint, so back off
+        # exponentially: cached torrents resolve on the first polls, slow ones poll rarely.
+        deadline = time.monotonic() + settings.rd_poll_max_seconds
+        delay = settings.rd_poll_initial_interval
+        links: List[str] = []
+        try:
+            while time.monotonic() < deadline:
                 info = await _rd_poll_info(client, torrent_id)
-                if not info:
-                    await asyncio.sleep(settings.rd_poll_interval)
-                    continue
-                links = info.get("links") or []
-                status = info.get("status") or ""
-                if links:
-                    break
-                if status in {"magnet_error", "error", "virus", "dead"}:
-                    return None
-                await asyncio.sleep(settings.rd_poll_interval)
-
-            if not links:
-                return None
-
-            # Unrestrict first link
-            direct = await _rd_unrestrict(client, links[0])
-            return direct or links[0]
+                if info:
+                    links = info.get("links") or []
+                    status = info.get("status") or ""
+                    if links:
+                        break
+                    if status in {"magnet_error", "error", "virus", "dead"}:
+                        return None
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, settings.rd_poll_interval)
+
+            if select_task is not None:
+                await select_task
+        finally:
+            # Early returns and errors must not leave the selection running unreferenced
+            if select_task is not None and not select_task.done():
+                select_task.cancel()
+                await asyncio.gather(select_task, return_exceptions=True)
+
+        if not links:
+            return None
+
+        # Unrestrict first link
+        _rd_state["cooldown"] = 0.0
+        direct = await _rd_unrestrict(client, links[0])
+        return direct or links[0]
+    except httpx.HTTPError:
+        _rd_mark_failed()
+        return None
     except Exception:
         return None
     return None
@@ -134,14 +240,6 @@ async def enrich_streams_with_subtitles(
         logger.info(f"Stream enrichment disabled (level={ENRICH_LEVEL_DISABLED}), returning {len(streams)} streams as-is")
         return streams
 
-    def _subtitle_langs_has_bg(raw_langs) -> bool:
-        langs: List[str] = []
-        if isinstance(raw_langs, str):
-            langs.extend([lang.strip().lower() for lang in raw_langs.split(",") if lang])
-        elif isinstance(raw_langs, list):
-            langs.extend([str(lang).strip().lower() for lang in raw_langs if lang])
-        return any(l.startswith("bg") or l.startswith("bul") for l in langs)
-
     def _mark_bg_content(stream: dict) -> None:
         """Mark Bulgarian subtitles AND audio based on metadata and probe results."""
         
@@ -153,7 +251,7 @@ async def enrich_streams_with_subtitles(
             lang = str((track or {}).get("lang") or "").strip().lower()
             title = str((track or {}).get("title") or "").strip().lower()
             
-            if lang.startswith("bg") or lang.startswith("bul"):
+            if _is_bg_lang(lang):
                 bg_in_embedded = True
                 break
             if "bulgarian" in title:
@@ -167,29 +265,15 @@ async def enrich_streams_with_subtitles(
         name = str(stream.get("name") or "")
         title = str(stream.get("title") or "")
         filename = str(stream.get("filename") or "")
-        combined_text = (name + " " + title + " " + filename).lower()
-        
-        # Normalize separators to spaces for better keyword matching
-        import re
-        combined_text = re.sub(r'[._\-]+', ' ', combined_text)
-        
-        audio_keywords = [
-            "bg audio", "bgaudio", "bg-audio",
-            "bg dub", "bgdub", "bg-dub",
-            "бг аудио", "бг дублаж",
-            "bulgarian audio", "bulgarian dub",
-            # Audio codec patterns (common in BG releases)
-            "bg aac", "bg ac3", "bg dd", "bg dts",
-            "bg 5 1", "bg 2 0",  # Channel configs
-        ]
-        
-        if any(kw in combined_text for kw in audio_keywords):
+        combined_text = name + " " + title + " " + filename
+
+        if _BG_AUDIO_RE.search(combined_text):
             bg_audio_found = True
             
         # Check probe results (if available)
         if stream.get("audio_langs"):
             audio_langs = stream.get("audio_langs") or []
-            if any(l.startswith("bg") or l.startswith("bul") for l in audio_langs):
+            if any(_is_bg_lang(l) for l in audio_langs):
                 bg_audio_found = True
 
         # Apply flags
@@ -216,29 +300,21 @@ async def enrich_streams_with_subtitles(
         # 🔊 = Audio
         # 🇧🇬🔊 = Both
         
-        flags = []
-        if bg_in_embedded:
-            flags.append(BULGARIAN_FLAG)
-        if bg_audio_found:
-            flags.append("🔊")
-            
-        if not flags:
+        flag_str = _FLAG_PREFIXES.get((bg_in_embedded, bg_audio_found))
+        if not flag_str:
             # Cleanup if re-processing
             try:
-                clean_name = name.replace(BULGARIAN_FLAG, "").replace("🔊", "").replace("💿", "").strip()
-                stream["name"] = clean_name
+                stream["name"] = _strip_flags(name)
             except Exception:
                 pass
             return
 
-        flag_str = " ".join(flags)
-        
         try:
             # Avoid duplication
             current_name = str(stream.get("name") or "")
             
             # Clean up existing flags first to ensure clean state
-            clean_name = current_name.replace(BULGARIAN_FLAG, "").replace("🔊", "").replace("💿", "").strip()
+            clean_name = _strip_flags(current_name)
             
             # Re-inject flags at the start
             stream["name"] = f"{flag_str} {clean_name}".strip()
@@ -272,7 +348,8 @@ async def enrich_streams_with_subtitles(
                         file_idx = int(raw_idx)
                     except Exception:
                         file_idx = None
-                resolved = await _resolve_with_rd(info_hash, file_idx)
+                async with _rd_sem:
+                    resolved = await _resolve_with_rd(info_hash, file_idx)
                 if resolved:
                     stream["url"] = resolved
                     stream.setdefault("behaviorHints", {})
@@ -320,39 +397,53 @@ async def enrich_streams_with_subtitles(
             return score
         
         # Sort streams by quality score (descending) and select top N for probing
-        probeable_streams = [s for s in streams if s.get("url") and s["url"].lower().startswith(("http://", "https://"))]
+        # A probe can only add BG subs/audio; streams already flagged for both need no probe,
+        # which leaves the probe budget to streams whose upstream metadata was incomplete
+        probeable_streams = [
+            s for s in streams
+            if s.get("url") and s["url"].lower().startswith(("http://", "https://"))
+            and not (s.get("subs_bg") and s.get("audio_bg"))
+        ]
         probeable_streams.sort(key=_stream_quality_score, reverse=True)
         
-        tasks = []
+        def _apply_probe(stream: dict, meta: Optional[dict]) -> None:
+            if not meta or isinstance(meta, BaseException):
+                return
+
+            # Process Subtitles
+            langs = [lang for lang in (meta.get("langs") or []) if lang]
+            if langs:
+                stream["subtitleLangs"] = ",".join(langs)
+                for lang in langs:
+                    stream[f"subs_{lang}"] = True
+
+            tracks = meta.get("tracks") or []
+            if tracks:
+                stream["embeddedSubtitles"] = tracks
+
+            # Process Audio
+            audio_langs = [lang for lang in (meta.get("audio_langs") or []) if lang]
+            if audio_langs:
+                stream["audio_langs"] = audio_langs
+
+            # Re-apply marker after probe results; the first pass already covered
+            # the stream unless the probe changed the tracks it reads
+            if tracks or audio_langs:
+                _mark_bg_content(stream)
+
+        # ffprobe runs are bounded by stream_probe's semaphore; the slice is only the ffprobe budget
         targets = probeable_streams[:settings.stream_subs_max_streams]
-        
-        for stream in targets:
-            tasks.append(asyncio.create_task(stream_probe.probe(stream["url"])))
+        tasks = [asyncio.create_task(stream_probe.probe(stream["url"])) for stream in targets]
+
+        # Streams past the budget still pick up probe results cached by earlier requests
+        for stream in probeable_streams[settings.stream_subs_max_streams:]:
+            _apply_probe(stream, stream_probe.get_cached(stream["url"]))
 
         if tasks:
-            results = await asyncio.gather(*tasks)
+            # A single failing probe must not drop the rest of the results
+            results = await asyncio.gather(*tasks, return_exceptions=True)
             for stream, meta in zip(targets, results):
-                if not meta:
-                    continue
-                
-                # Process Subtitles
-                langs = [lang for lang in (meta.get("langs") or []) if lang]
-                if langs:
-                    stream["subtitleLangs"] = ",".join(langs)
-                    for lang in langs:
-                        stream[f"subs_{lang}"] = True
-                
-                tracks = meta.get("tracks") or []
-                if tracks:
-                    stream["embeddedSubtitles"] = tracks
-                    
-                # Process Audio
-                audio_langs = [lang for lang in (meta.get("audio_langs") or []) if lang]
-                if audio_langs:
-                    stream["audio_langs"] = audio_langs
-                    
-                # Re-apply marker after probe results
-                _mark_bg_content(stream)
+                _apply_probe(stream, meta)
     else:
         # Level 1: Only check upstream metadata, no probing
         logger.info(f"Stream enrichment level {ENRICH_LEVEL_SCRAPER_ONLY}: Scraper check only (no video probing)")
@@ -362,30 +453,6 @@ async def enrich_streams_with_subtitles(
     # Scraper check removed to comply with strict "Embedded ONLY" flagging requirement.
     # External subtitles will not trigger any flags or indicators.
 
-    # Prioritize streams: 
-    # 1) BG Audio (Rare & High Value)
-    # 2) BG Embedded Subs
-    # 3) BG Found (but not embedded)
-    # 4) Everything else
-    def _priority(stream: dict) -> int:
-        tags = stream.get("visualTags") or []
-        has_bg_audio = "bg-audio" in tags
-        has_bg_embedded = "bg-embedded" in tags
-        
-        # Check for any indication of BG subs (scraped, metadata, or embedded list)
-        has_bg_subs = bool(
-            stream.get("subs_bg")
-            or ("bg-subs" in tags)
-            or _subtitle_langs_has_bg(stream.get("subtitleLangs"))
-        )
-
-        if has_bg_audio:
-            return 0  # 1. BG Audio (Top Priority)
-        if has_bg_embedded:
-            return 1  # 2. BG Embedded Subs
-        if has_bg_subs:
-            return 2  # 3. BG Found (but not embedded)
-        return 3      # 4. Everything else
-
-    indexed_sorted = sorted(enumerate(streams), key=lambda pair: (_priority(pair[1]), pair[0]))
-    return [stream for _, stream in indexed_sorted]
+    # list.sort is stable, so streams of equal priority keep their upstream order
+    streams.sort(key=_priority)
+    return streams
@@ -35,7 +35,9 @@ class Settings(BaseSettings):
     rd_token: Optional[str] = None
     realdebrid_token: Optional[str] = None
     rd_poll_max_seconds: int = 10  # Faster timeout for RealDebrid
-    rd_poll_interval: float = 1.5  # Faster polling
+    rd_poll_interval: float = 1.5  # Backoff cap between polls
+    rd_poll_initial_interval: float = 0.1  # First backoff step, doubled per poll
+    rd_concurrency: int = 8  # Magnets resolved against RD at once (rate limit)
     admin_password: Optional[str] = None
     tr_server: str = 'https://ca6771aaa821-toast-ratings.baby-beamup.club'
     testing: bool = False
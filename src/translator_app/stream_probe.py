@@ -115,6 +115,16 @@ def _parse_tracks(raw: Dict) -> Optional[Dict]:
     }
 
 
+def get_cached(url: str) -> Optional[Dict]:
+    """Return a previously stored probe result without running ffprobe."""
+    if not PROBE_ENABLED or not url:
+        return None
+    try:
+        return _cache.get(url)
+    except Exception:
+        return None
+
+
 async def probe(url: str) -> Optional[Dict]:
     if not PROBE_ENABLED:
         return None
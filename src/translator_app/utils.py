@@ -1,10 +1,15 @@
 import base64
+import functools
 import urllib.parse
 import socket
+from cachetools import TTLCache, cached
 from fastapi import HTTPException
 
+@functools.lru_cache(maxsize=4096)
 def decode_base64_url(encoded_url: str) -> str:
     """Decode a base64-encoded URL or return the original if not base64.
+
+    Memoized, since every request from a given install carries the same token.
     
     Args:
         encoded_url: Potentially base64-encoded URL string
@@ -48,6 +53,15 @@ def _is_safe_ip(ip: str) -> bool:
     except (socket.error, ValueError):
         return False
 
+# Host checks are only trusted briefly, so a name later pointed at a private address is re-checked
+@cached(TTLCache(maxsize=1024, ttl=60))
+def _resolve_public_host(hostname: str) -> str:
+    """Resolve hostname and return its address; raises ValueError for non-public addresses."""
+    ip_address = socket.gethostbyname(hostname)
+    if not _is_safe_ip(ip_address):
+        raise ValueError(f"URL resolves to a non-public IP address: {ip_address}")
+    return ip_address
+
 def _validate_addon_url(url: str):
     """
     Validates a URL to ensure it's safe to request.
@@ -62,11 +76,7 @@ def _validate_addon_url(url: str):
         if not hostname:
             raise ValueError("URL must contain a valid hostname.")
 
-        # This DNS lookup can be slow. In a high-performance scenario, consider caching.
-        ip_address = socket.gethostbyname(hostname)
-
-        if not _is_safe_ip(ip_address):
-            raise ValueError(f"URL resolves to a non-public IP address: {ip_address}")
+        _resolve_public_host(hostname)
             
     except (ValueError, socket.gaierror) as e:
         raise HTTPException(status_code=400, detail=f"Invalid or unsafe addon URL: {e}")
@@ -75,24 +85,34 @@ def normalize_addon_url(raw_url: str) -> str:
     """
     Validates, resolves, and normalizes an addon URL.
     Raises HTTPException for unsafe URLs.
+
+    Only the parsing is memoized; the address check runs through a short-lived host cache.
     """
     if not raw_url:
         return ""
     
     # Security: Validate before proceeding
     _validate_addon_url(raw_url)
-    
+    return _strip_manifest_path(raw_url)
+
+@functools.lru_cache(maxsize=1024)
+def _strip_manifest_path(raw_url: str) -> str:
     try:
         parsed = urllib.parse.urlparse(raw_url)
-        path = parsed.path or ""
-        if path.endswith("/manifest.json"):
-            path = path.removesuffix("/manifest.json")
-        
-        return parsed._replace(path=path).geturl().rstrip("/")
-    except Exception:
-        # Fallback for any unexpected parsing errors
+    except ValueError:
+        # urlparse only raises on malformed netlocs (e.g. an unclosed IPv6 bracket)
         return raw_url.rstrip("/")
 
+    path = parsed.path
+    if path.endswith("/manifest.json"):
+        path = path.removesuffix("/manifest.json")
+
+    return parsed._replace(path=path).geturl().rstrip("/")
+
+def decode_addon_url(token: str) -> str:
+    """Decode and normalize the addon URL path segment."""
+    return normalize_addon_url(decode_base64_url(token))
+
 def parse_user_settings(user_settings: str) -> dict:
     """Parses a comma-separated key-value string into a dict."""
     settings_dict = {}
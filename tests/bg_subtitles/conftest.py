@@ -0,0 +1,11 @@
+import pytest
+
+from src.bg_subtitles_app import app as app_module
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    # Tests stub the search per case, so finished bodies must not leak between them
+    app_module.RESPONSE_CACHE.clear()
+    yield
+    app_module.RESPONSE_CACHE.clear()
@@ -1,7 +1,9 @@
+import asyncio
 import os
 import sys
 from pathlib import Path
 
+import cachetools
 import pytest
 
 from fastapi.testclient import TestClient  # noqa: E402
@@ -41,7 +43,7 @@ def client():
 
 def test_plain_route_object_wrapper_default(monkeypatch, client):
     # Ensure default: no array-on-plain flag
-    os.environ.pop("BG_SUBS_ARRAY_ON_PLAIN", None)
+    monkeypatch.setattr(app_module, "_ARRAY_ON_PLAIN", False)
 
     async def stub(media_type, imdb_id, per_source=1, player=None):
         return _fake_results(2)
@@ -56,7 +58,7 @@ def test_plain_route_object_wrapper_default(monkeypatch, client):
 
 
 def test_plain_route_array_when_flag_set(monkeypatch, client):
-    os.environ["BG_SUBS_ARRAY_ON_PLAIN"] = "1"
+    monkeypatch.setattr(app_module, "_ARRAY_ON_PLAIN", True)
 
     async def stub(media_type, imdb_id, per_source=1, player=None):
         return _fake_results(2)
@@ -68,11 +70,9 @@ def test_plain_route_array_when_flag_set(monkeypatch, client):
     data = resp.json()
     assert isinstance(data, list)
 
-    os.environ.pop("BG_SUBS_ARRAY_ON_PLAIN", None)
-
 
 def test_plain_route_limit_applied(monkeypatch, client):
-    os.environ.pop("BG_SUBS_ARRAY_ON_PLAIN", None)
+    monkeypatch.setattr(app_module, "_ARRAY_ON_PLAIN", False)
 
     async def stub(media_type, imdb_id, per_source=1, player=None):
         return _fake_results(2)
@@ -87,7 +87,7 @@ def test_plain_route_limit_applied(monkeypatch, client):
 
 def test_safe_variants_env_passed(monkeypatch, client):
     # Verify BG_SUBS_SAFE_VARIANTS influences per_source when variants not provided
-    os.environ["BG_SUBS_SAFE_VARIANTS"] = "2"
+    monkeypatch.setattr(app_module, "_SAFE_VARIANTS", 2)
     seen = {"per_source": None}
 
     async def stub(media_type, imdb_id, per_source=1, player=None):
@@ -100,13 +100,11 @@ def test_safe_variants_env_passed(monkeypatch, client):
     assert resp.status_code == 200
     assert seen["per_source"] == 2
 
-    os.environ.pop("BG_SUBS_SAFE_VARIANTS", None)
-
 
 def test_plain_route_omni_minimal(monkeypatch, client):
-    os.environ["BG_SUBS_ARRAY_ON_PLAIN"] = "1"
-    os.environ["BG_SUBS_OMNI_MINIMAL"] = "1"
-    os.environ["BG_SUBS_OMNI_TOTAL_LIMIT"] = "1"
+    monkeypatch.setattr(app_module, "_ARRAY_ON_PLAIN", True)
+    monkeypatch.setattr(app_module, "_OMNI_MINIMAL", True)
+    monkeypatch.setattr(app_module, "_OMNI_TOTAL_LIMIT", 1)
 
     async def stub(media_type, imdb_id, per_source=1, player=None):
         return _fake_results(2)
@@ -122,15 +120,11 @@ def test_plain_route_omni_minimal(monkeypatch, client):
     keys = set(data[0].keys())
     assert keys == {"id", "url", "lang", "title"}
 
-    os.environ.pop("BG_SUBS_ARRAY_ON_PLAIN", None)
-    os.environ.pop("BG_SUBS_OMNI_MINIMAL", None)
-    os.environ.pop("BG_SUBS_OMNI_TOTAL_LIMIT", None)
-
 
 def test_json_route_uses_safe_variants_and_default_limit(monkeypatch, client):
     # Ensure JSON route honors BG_SUBS_SAFE_VARIANTS (shared with plain route)
-    os.environ["BG_SUBS_SAFE_VARIANTS"] = "2"
-    os.environ["BG_SUBS_DEFAULT_LIMIT"] = "1"
+    monkeypatch.setattr(app_module, "_SAFE_VARIANTS", 2)
+    monkeypatch.setattr(app_module, "_DEFAULT_LIMIT", 1)
 
     calls = {"per_source": None}
 
@@ -149,12 +143,9 @@ def test_json_route_uses_safe_variants_and_default_limit(monkeypatch, client):
     # per_source propagated from BG_SUBS_SAFE_VARIANTS
     assert calls["per_source"] == 2
 
-    os.environ.pop("BG_SUBS_SAFE_VARIANTS", None)
-    os.environ.pop("BG_SUBS_DEFAULT_LIMIT", None)
-
 
 def test_plain_route_single_per_provider(monkeypatch, client):
-    os.environ["BG_SUBS_SINGLE_PER_PROVIDER"] = "1"
+    monkeypatch.setattr(app_module, "_SINGLE_PER_PROVIDER", True)
 
     async def stub(media_type, imdb_id, per_source=1, player=None):
         return [
@@ -196,11 +187,9 @@ def test_plain_route_single_per_provider(monkeypatch, client):
     data = resp.json()
     assert len(data["subtitles"]) == 2
 
-    os.environ.pop("BG_SUBS_SINGLE_PER_PROVIDER", None)
-
 
 def test_stremio_route_single_per_provider(monkeypatch, client):
-    os.environ["BG_SUBS_SINGLE_PER_PROVIDER"] = "1"
+    monkeypatch.setattr(app_module, "_SINGLE_PER_PROVIDER", True)
 
     async def stub(media_type, imdb_id, per_source=1, player=None):
         return [
@@ -242,4 +231,212 @@ def test_stremio_route_single_per_provider(monkeypatch, client):
     data = resp.json()
     assert len(data["subtitles"]) == 2
 
-    os.environ.pop("BG_SUBS_SINGLE_PER_PROVIDER", None)
+
+def test_label_in_lang_uses_provider_label(monkeypatch, client):
+    async def stub(media_type, imdb_id, per_source=1, player=None):
+        return _fake_results(2)
+
+    monkeypatch.setattr(app_module, "search_subtitles_async", stub, raising=False)
+    monkeypatch.setattr(app_module, "_LABEL_IN_LANG", True)
+    monkeypatch.setattr(app_module, "_VIDI_MODE", False)
+
+    resp = client.get("/subtitles/movie/tt0000001.json")
+    assert resp.status_code == 200
+    subs = resp.json()["subtitles"]
+    labels = {s["id"]: app_module.PROVIDER_LABELS.get(s["id"].split(":")[0]) for s in subs}
+    assert subs[0]["lang"] == f"{app_module.LANGUAGE} • 23.976 fps • {labels['unacs:0']}"
+    assert subs[1]["lang"] == f"{app_module.LANGUAGE} • {labels['subs_sab:1']}"
+
+
+def test_subtitles_json_revalidates_with_etag(monkeypatch, client):
+    async def stub(media_type, imdb_id, per_source=1, player=None):
+        return _fake_results(2)
+
+    monkeypatch.setattr(app_module, "search_subtitles_async", stub, raising=False)
+
+    first = client.get("/subtitles/movie/tt0000001.json")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    second = client.get("/subtitles/movie/tt0000001.json", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+
+
+@pytest.mark.parametrize("path", [
+    "/stremio/subtitles/movie/tt0000001.json",
+    "/stremio/cfg/subtitles/movie/tt0000001.json",
+    "/stremio/cfg/subtitles/movie/tt0000001/filename=A.mkv.json",
+])
+def test_stremio_prefixes_use_iso639_1(monkeypatch, client, path):
+    async def stub(media_type, imdb_id, per_source=1, player=None):
+        return _fake_results(1)
+
+    monkeypatch.setattr(app_module, "search_subtitles_async", stub, raising=False)
+
+    resp = client.get(path)
+    assert resp.status_code == 200
+    assert [s["lang"] for s in resp.json()["subtitles"]] == [app_module.LANG_ISO639_1]
+
+
+def test_debug_log_lines_are_batched_through_queue(monkeypatch):
+    written = []
+    monkeypatch.setattr(app_module, "_write_stdout", written.append)
+
+    async def run():
+        app_module._log_json({"msg": "a"})
+        app_module._log_json({"msg": "b"})
+        assert written == []
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    assert written == [b'{"msg":"a"}\n{"msg":"b"}\n']
+
+
+def test_manifests_are_served_from_prebuilt_bodies(client):
+    assert client.get("/manifest.json").json() == app_module.MANIFEST
+    stremio = client.get("/stremio/manifest.json")
+    assert stremio.headers["content-type"] == "application/json"
+    assert stremio.json() == app_module.STREMIO_MANIFEST
+
+
+def test_subtitle_download_resolves_in_worker_thread(monkeypatch, client):
+    on_loop = []
+
+    def fake_resolve(token):
+        try:
+            asyncio.get_running_loop()
+            on_loop.append(True)
+        except RuntimeError:
+            on_loop.append(False)
+        return {"content": b"1\n00:00:01,000 --> 00:00:02,000\nHi\n", "filename": "A.srt", "format": "srt"}
+
+    monkeypatch.setattr(app_module, "resolve_subtitle", fake_resolve)
+
+    resp = client.get("/subtitle/tok.srt")
+    assert resp.status_code == 200
+    assert resp.content == b"1\r\n00:00:01,000 --> 00:00:02,000\r\nHi\r\n"
+    assert client.head("/subtitle/tok.srt").content == b""
+    assert on_loop == [False, False]
+
+
+def test_subtitle_download_logs_from_the_event_loop(monkeypatch, client):
+    records = []
+
+    def fake_log_json(record):
+        asyncio.get_running_loop()  # raises when called from the worker thread
+        records.append(record)
+
+    monkeypatch.setattr(app_module, "_debug_enabled", lambda: True)
+    monkeypatch.setattr(app_module, "_log_json", fake_log_json)
+    monkeypatch.setattr(
+        app_module,
+        "resolve_subtitle",
+        lambda token: {"content": b"1\n00:00:01,000 --> 00:00:02,000\nHi\n", "filename": "A.srt", "format": "srt"},
+    )
+
+    full = client.get("/subtitle/log-tok.srt")
+    partial = client.get("/subtitle/log-tok.srt", headers={"Range": "bytes=0-3"})
+
+    assert (full.status_code, partial.status_code) == (200, 206)
+    assert [(r["msg"], r.get("length"), r.get("range")) for r in records] == [
+        ("full", len(full.content), None),
+        ("partial", None, "0-3"),
+    ]
+    assert records[1]["total"] == len(full.content)
+
+
+def test_subtitle_download_etag_is_memoized_per_token(monkeypatch, client):
+    app_module.DOWNLOAD_ETAGS.clear()
+    hashed = []
+    real_md5 = app_module.hashlib.md5
+
+    def counting_md5(data):
+        hashed.append(data)
+        return real_md5(data)
+
+    monkeypatch.setattr(app_module.hashlib, "md5", counting_md5)
+    monkeypatch.setattr(
+        app_module,
+        "resolve_subtitle",
+        lambda token: {"content": b"1\n00:00:01,000 --> 00:00:02,000\nHi\n", "filename": "A.srt", "format": "srt"},
+    )
+
+    first = client.get("/subtitle/etag-tok.srt")
+    etag = first.headers["etag"]
+    second = client.get("/subtitle/etag-tok.srt", headers={"If-None-Match": etag})
+
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert len(hashed) == 1
+    app_module.DOWNLOAD_ETAGS.clear()
+
+
+def test_subtitle_list_body_is_cached_per_request_shape(monkeypatch, client):
+    monkeypatch.setattr(app_module, "_ARRAY_ON_PLAIN", False)
+    calls = []
+
+    async def stub(media_type, imdb_id, per_source=1, player=None):
+        calls.append(imdb_id)
+        return _fake_results(2)
+
+    monkeypatch.setattr(app_module, "search_subtitles_async", stub, raising=False)
+
+    first = client.get("/subtitles/movie/tt0000042.json")
+    second = client.get("/subtitles/movie/tt0000042.json")
+    ios = client.get("/subtitles/movie/tt0000042.json", headers={"User-Agent": "iPhone"})
+
+    assert first.content == second.content
+    assert first.headers["etag"] == second.headers["etag"]
+    assert len(calls) == 2
+    assert set(ios.json()["subtitles"][0]) == {"id", "url", "lang", "name"}
+
+
+def test_subtitle_list_cache_is_bounded(monkeypatch, client):
+    monkeypatch.setattr(app_module, "RESPONSE_CACHE", cachetools.TTLCache(maxsize=2, ttl=600))
+
+    async def stub(media_type, imdb_id, per_source=1, player=None):
+        return _fake_results(1)
+
+    monkeypatch.setattr(app_module, "search_subtitles_async", stub, raising=False)
+
+    # Per-file player params make every URL a distinct key
+    for size in range(5):
+        client.get(f"/subtitles/movie/tt0000044.json?videoSize={size}")
+
+    assert len(app_module.RESPONSE_CACHE) == 2
+
+
+def test_subtitle_list_built_from_stale_results_is_not_cached(monkeypatch, client):
+    calls = []
+
+    async def stale_stub(media_type, imdb_id, per_source=1, player=None):
+        calls.append(imdb_id)
+        app_module.SERVED_STALE.set(True)
+        return _fake_results(2)
+
+    monkeypatch.setattr(app_module, "search_subtitles_async", stale_stub, raising=False)
+
+    client.get("/subtitles/movie/tt0000043.json")
+    client.get("/subtitles/movie/tt0000043.json")
+
+    assert len(calls) == 2
+
+
+def test_log_queue_reports_drops_and_flushes_on_shutdown(monkeypatch):
+    written = []
+    monkeypatch.setattr(app_module, "_write_stdout", written.append)
+    monkeypatch.setattr(app_module, "_LOG_QUEUE_SIZE", 1)
+
+    async def run():
+        for msg in ("a", "b", "c"):
+            app_module._log_json({"msg": msg})
+        await app_module.shutdown()
+
+    asyncio.run(run())
+
+    assert written[0].startswith(b'{"msg":"a"}\n{"ts":')
+    assert b'"dropped":2' in written[0]
+    assert app_module._log_task is None
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from src.bg_subtitles_app.bg_subtitles import service  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_search_caches():
+    for cache in (service.RESULT_CACHE, service.STALE_RESULT_CACHE, service.EMPTY_CACHE):
+        cache.clear()
+    yield
+    for cache in (service.RESULT_CACHE, service.STALE_RESULT_CACHE, service.EMPTY_CACHE):
+        cache.clear()
+
+
+def test_concurrent_misses_share_one_search(monkeypatch):
+    calls = []
+
+    async def fake_uncached(key, media_type, raw_id, per_source, player):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return [{"id": "unacs:0"}]
+
+    monkeypatch.setattr(service, "_search_subtitles_uncached", fake_uncached)
+
+    async def run():
+        return await asyncio.gather(*(service.search_subtitles_async("movie", "tt0000001") for _ in range(3)))
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert results == [[{"id": "unacs:0"}]] * 3
+
+
+def test_expired_results_are_served_stale_and_refreshed(monkeypatch):
+    key = service._result_cache_key("movie", "tt0000001", 1, {})
+    service.STALE_RESULT_CACHE[key] = [{"id": "old:0"}]
+    refreshed = []
+
+    async def fake_uncached(key, media_type, raw_id, per_source, player):
+        refreshed.append(key)
+        service.RESULT_CACHE.set(key, [{"id": "new:0"}])
+        return [{"id": "new:0"}]
+
+    monkeypatch.setattr(service, "_search_subtitles_uncached", fake_uncached)
+
+    async def run():
+        first = await service.search_subtitles_async("movie", "tt0000001")
+        await asyncio.sleep(0)
+        second = await service.search_subtitles_async("movie", "tt0000001")
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert first == [{"id": "old:0"}]
+    assert second == [{"id": "new:0"}]
+    assert refreshed == [key]
+
+
+def test_empty_refresh_keeps_stale_results_for_a_ttl_window(monkeypatch):
+    key = service._result_cache_key("movie", "tt0000001", 1, {})
+    service.STALE_RESULT_CACHE[key] = [{"id": "old:0"}]
+    refreshed = []
+
+    async def fake_uncached(key, media_type, raw_id, per_source, player):
+        refreshed.append(key)
+        return []
+
+    monkeypatch.setattr(service, "_search_subtitles_uncached", fake_uncached)
+
+    async def run():
+        results = []
+        for _ in range(3):
+            results.append(await service.search_subtitles_async("movie", "tt0000001"))
+            await asyncio.sleep(0)
+        return results
+
+    results = asyncio.run(run())
+
+    assert results == [[{"id": "old:0"}]] * 3
+    assert refreshed == [key]
+
+
+def test_sync_search_closes_its_provider_client(monkeypatch):
+    clients = []
+
+    async def fake_uncached(key, media_type, raw_id, per_source, player):
+        clients.append(service._provider_client())
+        return [{"id": "unacs:0"}]
+
+    monkeypatch.setattr(service, "_search_subtitles_uncached", fake_uncached)
+
+    assert service.search_subtitles("movie", "tt0000001") == [{"id": "unacs:0"}]
+    assert clients[0].is_closed
+    assert service._PROVIDER_CLIENT is None
@@ -0,0 +1,92 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.translator_app.services.anime_utils import remove_duplicates
+
+
+@pytest.mark.asyncio
+async def test_remove_duplicates_collapses_tv_seasons():
+    """Test that TV seasons mapping to the same imdb id are collapsed."""
+    catalog = {
+        "metas": [
+            {"id": "kitsu:1", "type": "series", "animeType": "TV"},
+            {"id": "kitsu:2", "type": "series", "animeType": "TV"},
+            {"id": "mal_3", "type": "series", "animeType": "OVA"},
+            None,
+            {"name": "missing id"},
+        ]
+    }
+    kitsu_map = {"kitsu:1": "tt100", "kitsu:2": "tt100"}
+    mal_map = {"mal:3": "tt100"}
+    metas = catalog["metas"]
+
+    with patch('src.translator_app.anime.kitsu.convert_to_imdb_many', new=AsyncMock(return_value=kitsu_map)) as mock_kitsu, \
+         patch('src.translator_app.anime.mal.convert_to_imdb_many', new=AsyncMock(return_value=mal_map)) as mock_mal:
+        await remove_duplicates(catalog)
+
+    mock_kitsu.assert_awaited_once_with([("kitsu:1", "series"), ("kitsu:2", "series")])
+    mock_mal.assert_awaited_once_with([("mal:3", "series")])
+    assert catalog["metas"] is metas
+    assert [m["id"] for m in catalog["metas"]] == ["kitsu:1", "mal_3"]
+    assert all(m["imdb_id"] == "tt100" for m in catalog["metas"])
+
+
+@pytest.mark.asyncio
+async def test_remove_duplicates_keeps_everything_without_tv():
+    """Test that catalogs without TV entries keep all items."""
+    catalog = {
+        "metas": [
+            {"id": "kitsu:1", "type": "movie", "animeType": "movie"},
+            {"id": "kitsu:2", "type": "movie", "animeType": "movie"},
+        ]
+    }
+    kitsu_map = {"kitsu:1": "tt100", "kitsu:2": "tt100"}
+
+    with patch('src.translator_app.anime.kitsu.convert_to_imdb_many', new=AsyncMock(return_value=kitsu_map)), \
+         patch('src.translator_app.anime.mal.convert_to_imdb_many', new=AsyncMock(return_value={})):
+        await remove_duplicates(catalog)
+
+    assert len(catalog["metas"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_convert_to_imdb_many_fetches_each_miss_once():
+    """Test that cached ids are reused and each distinct miss is looked up once."""
+    from src.translator_app.anime import imdb_ids
+
+    cache = {"kitsu:1": "tt0000001"}
+    cache_handle = Mock()
+    cache_handle.get.side_effect = cache.get
+    cache_handle.set.side_effect = cache.__setitem__
+    response = Mock()
+    response.json.return_value = {"meta": {"imdb_id": "tt0000002"}}
+    client = Mock()
+    client.get = AsyncMock(return_value=response)
+
+    items = [("kitsu:1", "series"), ("kitsu:2", "series"), ("kitsu:2", "series")]
+    with patch.object(imdb_ids, "get_http_client", return_value=client):
+        result = await imdb_ids.convert_to_imdb_many(cache_handle, "https://addon", items)
+
+    assert result == {"kitsu:1": "tt0000001", "kitsu:2": "tt0000002"}
+    client.get.assert_awaited_once_with("https://addon/meta/series/kitsu%3A2.json", timeout=20)
+    assert cache["kitsu:2"] == "tt0000002"
+
+
+@pytest.mark.asyncio
+async def test_fetch_imdb_id_remembers_ids_without_imdb_mapping():
+    """Test that a meta without imdb_id caches the anime id, while other errors propagate."""
+    from src.translator_app.anime import imdb_ids
+
+    cache = Mock()
+    response = Mock()
+    response.json.return_value = {"meta": {}}
+    client = Mock()
+    client.get = AsyncMock(return_value=response)
+
+    assert await imdb_ids.fetch_imdb_id(client, cache, "https://addon", "kitsu:3", "series") == ("kitsu:3", False)
+    cache.set.assert_called_once_with("kitsu:3", "kitsu:3")
+
+    response.json.side_effect = RuntimeError("boom")
+    with pytest.raises(RuntimeError):
+        await imdb_ids.fetch_imdb_id(client, cache, "https://addon", "kitsu:4", "series")
@@ -2,14 +2,18 @@ import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock, Mock
 import httpx
+import orjson
 from src.translator_app.main import app
+from src.translator_app.cache_manager import get_catalog_cache
 
 @pytest.fixture
 def client():
-    with TestClient(app) as c:
+    # Keep the SSRF address check off the network; the mocked upstream is public
+    with patch('src.translator_app.utils._resolve_public_host', return_value='93.184.216.34'), TestClient(app) as c:
+        # Translated catalogs are cached; start every test from upstream
+        get_catalog_cache().clear()
         yield c
 
-@pytest.mark.asyncio
 @pytest.mark.asyncio
 async def test_get_catalog_success(client):
     """Test successful retrieval and translation of a catalog."""
@@ -17,7 +21,7 @@ async def test_get_catalog_success(client):
         # Mock the upstream addon's response
         mock_response = Mock()
         mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_response.content = orjson.dumps({
             "metas": [
                 {
                     "id": "tt0076759",
@@ -25,7 +29,7 @@ async def test_get_catalog_success(client):
                     "type": "movie"
                 }
             ]
-        }
+        })
         mock_get.return_value = mock_response
 
         # Mock the TMDB response
@@ -52,6 +56,26 @@ async def test_get_catalog_success(client):
             assert len(data["metas"]) == 1
             assert data["metas"][0]["name"] == "Star Wars: Episode IV - A New Hope"
             assert "The Imperial Forces" in data["metas"][0]["description"]
+            assert response.headers["cache-control"] == "public, max-age=300"
+
+@pytest.mark.asyncio
+async def test_get_catalog_served_from_cache(client):
+    """A repeated identical request is answered from the catalog cache without upstream I/O."""
+    url = "/aHR0cHM6Ly9jaW5lbWV0YS5zdHJlbS5pbw==/language=en,rpdb=false/catalog/movie/popular.json"
+    with patch('httpx.AsyncClient.get') as mock_get, \
+         patch('src.translator_app.api.tmdb.get_tmdb_data', new_callable=AsyncMock) as mock_tmdb:
+        mock_get.return_value = Mock(status_code=200, content=orjson.dumps({"metas": [{"id": "tt0076759", "name": "Star Wars", "type": "movie"}]}))
+        mock_tmdb.return_value = {"movie_results": [{"title": "Star Wars", "overview": "A long time ago...", "poster_path": "/poster.jpg"}]}
+
+        first = client.get(url)
+        second = client.get(url)
+
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["cache-control"] == "public, max-age=300"
+    mock_get.assert_awaited_once()
+    mock_tmdb.assert_awaited_once()
+    assert len(get_catalog_cache()) == 1
 
 @pytest.mark.asyncio
 async def test_get_catalog_upstream_error(client):
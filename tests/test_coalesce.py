@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from src.translator_app.coalesce import coalesce
+
+
+@pytest.mark.asyncio
+async def test_coalesce_shares_one_call_and_forgets_the_key():
+    """Test that concurrent callers for one key share a single factory call."""
+    registry = {}
+    release = asyncio.Event()
+    calls = []
+
+    async def factory():
+        calls.append(1)
+        await release.wait()
+        return b"body"
+
+    tasks = [asyncio.create_task(coalesce(registry, "k", factory)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [b"body"] * 3
+    assert calls == [1]
+    assert registry == {}
+
+
+@pytest.mark.asyncio
+async def test_coalesce_survives_the_first_caller_being_cancelled():
+    """Test that a disconnecting first caller does not cancel the work for the others."""
+    registry = {}
+    release = asyncio.Event()
+
+    async def factory():
+        await release.wait()
+        return b"body"
+
+    leader = asyncio.create_task(coalesce(registry, "k", factory))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(coalesce(registry, "k", factory))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiter == b"body"
+    assert leader.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_propagates_errors_to_every_caller():
+    """Test that a failing factory raises for all callers and is retried afterwards."""
+    registry = {}
+
+    async def failing():
+        await asyncio.sleep(0)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(*(coalesce(registry, "k", failing) for _ in range(2)), return_exceptions=True)
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert registry == {}
@@ -0,0 +1,174 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import orjson
+import pytest
+
+from src.translator_app.providers import letterboxd
+
+
+@pytest.fixture(autouse=True)
+def clear_memory_cache():
+    letterboxd._memory_cache.clear()
+    letterboxd._manifest_ids.clear()
+    letterboxd._catalog_bodies.clear()
+    yield
+    letterboxd._memory_cache.clear()
+    letterboxd._manifest_ids.clear()
+    letterboxd._catalog_bodies.clear()
+
+
+@pytest.mark.asyncio
+async def test_enrich_catalog_metas_only_fetches_cache_misses():
+    """Test that cached Letterboxd resolutions are applied without a resolver request."""
+    cache = {"cached-film": {"slug": "cached-film", "imdb": "tt0000001", "tmdb": 1}}
+    resolve_cache = Mock()
+    resolve_cache.get.side_effect = cache.get
+    response = Mock(content=orjson.dumps([{"slug": "new-film", "imdb": "tt0000002", "tmdb": 2}]))
+    client = Mock()
+    client.get = AsyncMock(return_value=response)
+    metas = [
+        {"id": "letterboxd:cached-film", "type": "movie"},
+        {"id": "letterboxd:new-film", "type": "movie"},
+        {"id": "tt0000003", "imdb_id": "tt0000003", "type": "movie"},
+    ]
+
+    with patch.object(letterboxd, "resolve_cache", resolve_cache):
+        await letterboxd.enrich_catalog_metas(client, metas, None, "en-US")
+
+    client.get.assert_awaited_once_with(f"{letterboxd.LETTERBOXD_RESOLVE_BASE}/slug/new-film")
+    assert [m["imdb_id"] for m in metas] == ["tt0000001", "tt0000002", "tt0000003"]
+
+
+@pytest.mark.asyncio
+async def test_enrich_catalog_metas_resolves_repeated_identifiers_once():
+    """Test that the same Letterboxd entry appearing twice is resolved with one request."""
+    response = Mock(content=orjson.dumps([{"slug": "film", "imdb": "tt0000001", "tmdb": 1}]))
+    client = Mock()
+    client.get = AsyncMock(return_value=response)
+    metas = [
+        {"id": "letterboxd:film", "type": "movie"},
+        {"id": "letterboxd:other", "imdb_id": "tt0000002", "type": "movie"},
+        {"id": "letterboxd:film", "type": "movie"},
+    ]
+
+    with patch.object(letterboxd, "resolve_cache", None):
+        await letterboxd.enrich_catalog_metas(client, metas, None, "en-US")
+
+    client.get.assert_awaited_once_with(f"{letterboxd.LETTERBOXD_RESOLVE_BASE}/slug/film")
+    assert [m["imdb_id"] for m in metas] == ["tt0000001", "tt0000002", "tt0000001"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_resolution_coalesces_on_cache_key():
+    """Test that resolver requests are single-flighted on the Letterboxd registry by cache key."""
+    calls = []
+
+    async def spy(registry, key, factory):
+        calls.append((registry, key))
+        return await factory()
+
+    client = Mock()
+    client.get = AsyncMock(return_value=Mock(content=orjson.dumps([{"slug": "film", "imdb": "tt0000001", "tmdb": 1}])))
+
+    with patch.object(letterboxd, "coalesce", spy), patch.object(letterboxd, "resolve_cache", None):
+        result = await letterboxd._fetch_resolution(client, "slug", "film", "film")
+
+    assert calls == [(letterboxd._inflight, "film")]
+    assert result["imdb"] == "tt0000001"
+    client.get.assert_awaited_once_with(f"{letterboxd.LETTERBOXD_RESOLVE_BASE}/slug/film")
+
+
+@pytest.mark.asyncio
+async def test_resolve_identifier_serves_repeat_lookups_from_memory():
+    """Test that a disk cache hit is kept in memory for the next lookup."""
+    resolve_cache = Mock()
+    resolve_cache.get.return_value = {"slug": "film", "imdb": "tt0000001", "tmdb": 1}
+
+    with patch.object(letterboxd, "resolve_cache", resolve_cache):
+        first = await letterboxd.resolve_identifier(Mock(), "letterboxd:film")
+        second = await letterboxd.resolve_identifier(Mock(), "letterboxd:film")
+
+    resolve_cache.get.assert_called_once_with("film")
+    assert first is second
+
+
+@pytest.mark.asyncio
+async def test_fetch_letterboxd_catalog_reuses_manifest_id():
+    """Test that repeat list fetches skip the config registration round trip."""
+    config_resp = Mock(status_code=200, content=orjson.dumps({"id": "m1"}))
+    catalog_resp = Mock(status_code=200, content=orjson.dumps({"metas": [{"id": "letterboxd:film"}]}))
+    client = Mock()
+    client.post = AsyncMock(return_value=config_resp)
+    client.get = AsyncMock(return_value=catalog_resp)
+
+    for _ in range(2):
+        letterboxd._catalog_bodies.clear()
+        metas = await letterboxd._fetch_letterboxd_catalog(client, "https://letterboxd.com/u/watchlist/", "watchlist")
+        assert metas == [{"id": "letterboxd:film"}]
+
+    client.post.assert_awaited_once()
+    assert client.get.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_letterboxd_catalog_serves_hot_lists_from_body_cache():
+    """Test that a recently fetched list is parsed from the cached body without any request."""
+    config_resp = Mock(status_code=200, content=orjson.dumps({"id": "m1"}))
+    catalog_resp = Mock(status_code=200, content=orjson.dumps({"metas": [{"id": "letterboxd:film"}]}))
+    client = Mock()
+    client.post = AsyncMock(return_value=config_resp)
+    client.get = AsyncMock(return_value=catalog_resp)
+
+    first = await letterboxd._fetch_letterboxd_catalog(client, "https://letterboxd.com/u/watchlist/", "watchlist")
+    first[0]["imdb_id"] = "tt0000001"
+    second = await letterboxd._fetch_letterboxd_catalog(client, "https://letterboxd.com/u/watchlist/", "watchlist")
+
+    client.post.assert_awaited_once()
+    client.get.assert_awaited_once()
+    assert second == [{"id": "letterboxd:film"}]
+
+
+@pytest.mark.asyncio
+async def test_enrich_catalog_metas_falls_back_to_tmdb_external_ids():
+    """Test that entries resolved only to a TMDB id get their imdb_id from external_ids."""
+    resolve_cache = Mock()
+    resolve_cache.get.return_value = {"slug": "show", "imdb": None, "tmdb": 1396}
+    metas = [{"id": "letterboxd:show", "type": "series"}]
+
+    with patch.object(letterboxd, "resolve_cache", resolve_cache), \
+         patch.object(letterboxd.tmdb, "get_external_ids", new=AsyncMock(return_value={"imdb_id": "tt0903747"})) as mock_ids:
+        await letterboxd.enrich_catalog_metas(Mock(), metas, "key", "en-US")
+
+    mock_ids.assert_awaited_once()
+    assert mock_ids.await_args.args[1:] == ("1396", "series", "en-US", "key")
+    assert metas[0]["imdb_id"] == "tt0903747"
+    assert metas[0]["tmdb_id"] == "1396"
+
+
+@pytest.mark.asyncio
+async def test_fetch_multi_list_catalog_dedupes_across_lists_in_order():
+    """Test that merged lists keep the first occurrence of each film."""
+    lists = [
+        [{"id": "letterboxd:a", "imdb_id": "tt1"}, {"id": "letterboxd:b"}],
+        [{"id": "letterboxd:a2", "imdb_id": "tt1"}, {"id": "letterboxd:c"}, {"name": "no id"}],
+    ]
+
+    with patch.object(letterboxd, "_fetch_letterboxd_catalog", new=AsyncMock(side_effect=lists)):
+        catalog = await letterboxd.fetch_multi_list_catalog(Mock(), ["user1", "user2"])
+
+    assert [m["id"] for m in catalog["metas"]] == ["letterboxd:a", "letterboxd:b", "letterboxd:c"]
+
+
+@pytest.mark.parametrize("identifier, expected", [
+    ("letterboxd:film", ("slug", "film", "film")),
+    ("letterboxd:id:12ab", ("id", "12ab", "id:12ab")),
+    ("letterboxd:list:film", ("slug", "film", "film")),
+    ("letterboxd:error", None),
+    ("letterboxd:error:film", None),
+    ("letterboxd:", None),
+    ("tt0000001", None),
+    ("", None),
+])
+def test_normalise_identifier(identifier, expected):
+    """Test that Letterboxd identifiers are split into mode, value and cache key."""
+    assert letterboxd._normalise_identifier(identifier) == expected
@@ -1,3 +1,8 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
 from src.translator_app.main import app
@@ -30,3 +35,13 @@ def test_languages():
     response = client.get("/languages.json")
     assert response.status_code == 200
     assert isinstance(response.json(), (dict, list))
+
+def test_import_from_other_working_directory(tmp_path):
+    """Bundled JSON files are resolved from the package, not the working directory"""
+    repo_root = Path(__file__).resolve().parents[1]
+    env = {**os.environ, "PYTHONPATH": str(repo_root)}
+    result = subprocess.run(
+        [sys.executable, "-c", "import src.translator_app.main"],
+        cwd=tmp_path, env=env, capture_output=True, text=True,
+    )
+    assert result.returncode == 0, result.stderr
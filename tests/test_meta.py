@@ -0,0 +1,147 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import orjson
+import pytest
+
+from src.translator_app.routers import meta
+from src.translator_app.routers.meta import _ID_HANDLERS, _handle_anime, _handle_imdb, _handle_letterboxd, _id_prefix
+
+
+def test_id_prefix_dispatch():
+    """Test that meta ids are routed by prefix, not by substring."""
+    assert _ID_HANDLERS[_id_prefix("tt0903747")] is _handle_imdb
+    assert _ID_HANDLERS[_id_prefix("kitsu:1376")] is _handle_anime
+    assert _ID_HANDLERS[_id_prefix("mal_5114")] is _handle_anime
+    assert _ID_HANDLERS[_id_prefix("letterboxd:pretty-woman")] is _handle_letterboxd
+    assert _id_prefix("tmdb:1396") == "tmdb"
+    assert _id_prefix("custom:123") not in _ID_HANDLERS
+
+
+@pytest.mark.asyncio
+async def test_get_meta_coalesces_misses_per_request_shape():
+    """Test that cache misses are single-flighted on the meta registry, keyed by everything the body depends on."""
+    calls = []
+
+    async def spy(registry, key, factory):
+        calls.append((registry, key))
+        return await factory()
+
+    meta_cache = Mock()
+    meta_cache.get.return_value = None
+    handler = AsyncMock(return_value={"meta": {"name": "Breaking Bad"}})
+    with patch.dict(meta._ID_HANDLERS, {"tt": handler}), \
+         patch.object(meta, "coalesce", spy), \
+         patch.object(meta, "get_meta_cache", return_value=meta_cache), \
+         patch.object(meta, "get_meta_negative_cache", return_value=Mock(get=Mock(return_value=None))), \
+         patch.object(meta, "decode_addon_url", return_value="https://addon"):
+        response = await meta.get_meta(Mock(), Mock(), "YWRkb24=", "tmdb_key=k1", "series", "tt0903747")
+
+    assert calls == [(meta._meta_inflight, ("https://addon", meta.settings.default_language, "series", "tt0903747", "k1"))]
+    assert orjson.loads(response.body) == {"meta": {"name": "Breaking Bad", "id": "tt0903747"}}
+
+
+@pytest.mark.asyncio
+async def test_get_meta_caches_empty_results():
+    """Test that ids resolving to an empty meta are not fetched again."""
+    negative = {}
+    negative_cache = Mock()
+    negative_cache.get.side_effect = negative.get
+    negative_cache.set.side_effect = negative.__setitem__
+    meta_cache = Mock()
+    meta_cache.get.return_value = None
+
+    handler = AsyncMock(return_value={})
+    with patch.dict(meta._ID_HANDLERS, {"tt": handler}), \
+         patch.object(meta, "get_meta_cache", return_value=meta_cache), \
+         patch.object(meta, "get_meta_negative_cache", return_value=negative_cache), \
+         patch.object(meta, "decode_addon_url", return_value="https://addon"):
+        for _ in range(2):
+            response = await meta.get_meta(Mock(), Mock(), "YWRkb24=", "language=en-US", "movie", "tt0000001")
+            assert response.body == b"{}"
+
+    handler.assert_awaited_once()
+    assert negative == {"movie:tt0000001": True}
+    meta_cache.set.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_probe_tmdb_addons_puts_fastest_healthy_addon_first():
+    """Test that the TMDB addon pool is reordered by probe latency."""
+    pool = ["https://dead", "https://slow", "https://fast"]
+    latencies = {"https://dead": float("inf"), "https://slow": 0.5, "https://fast": 0.1}
+
+    with patch.object(meta, "tmdb_addons_pool", pool), \
+         patch.object(meta, "tmdb_addon_meta_url", pool[0]), \
+         patch.object(meta, "_probe_tmdb_addon", new=AsyncMock(side_effect=latencies.get)):
+        await meta.probe_tmdb_addons()
+        assert pool == ["https://fast", "https://slow", "https://dead"]
+        assert meta.tmdb_addon_meta_url == "https://fast"
+
+
+@pytest.mark.asyncio
+async def test_first_ok_returns_first_healthy_response():
+    """Test that the parallel fan-out skips failures and cancels the rest."""
+    release_slow = asyncio.Event()
+
+    async def fake_get(url):
+        if url == "https://down/x":
+            return Mock(status_code=503)
+        if url == "https://slow/x":
+            await release_slow.wait()
+        return Mock(status_code=200, url=url)
+
+    client = Mock()
+    client.get = fake_get
+    url, response = await meta._first_ok(client, ["https://down/x", "https://slow/x", "https://up/x"])
+
+    assert url == "https://up/x"
+    assert response.status_code == 200
+    assert await meta._first_ok(client, ["https://down/x"]) == (None, None)
+
+
+@pytest.mark.parametrize("cinemeta_status, negative_cached", [(404, True), (503, False)])
+@pytest.mark.asyncio
+async def test_get_meta_only_caches_confirmed_misses(cinemeta_status, negative_cached):
+    """Test that a Cinemeta 404 is remembered as empty but an outage is not."""
+    negative = {}
+    negative_cache = Mock()
+    negative_cache.get.side_effect = negative.get
+    negative_cache.set.side_effect = negative.__setitem__
+    meta_cache = Mock()
+    meta_cache.get.return_value = None
+    cinemeta_client = Mock()
+    cinemeta_client.get = AsyncMock(return_value=Mock(status_code=cinemeta_status, content=b""))
+
+    with patch.object(meta.settings, "use_tmdb_addon", True), \
+         patch.object(meta.tmdb, "convert_imdb_to_tmdb", new=AsyncMock(return_value="tmdb:1")), \
+         patch.object(meta, "_first_ok_tmdb_addon", new=AsyncMock(return_value=None)), \
+         patch.object(meta, "get_http_client", return_value=cinemeta_client), \
+         patch.object(meta, "get_meta_cache", return_value=meta_cache), \
+         patch.object(meta, "get_meta_negative_cache", return_value=negative_cache), \
+         patch.object(meta, "decode_addon_url", return_value="https://addon"):
+        response = await meta.get_meta(Mock(), Mock(), "YWRkb24=", "language=en-US", "movie", "tt0000001")
+
+    assert response.body == b"{}"
+    assert bool(negative) is negative_cached
+    meta_cache.set.assert_not_called()
+
+
+@pytest.mark.parametrize("handler_result, body", [
+    (b'{"meta":{"id":"custom:1"}}', b'{"meta":{"id":"custom:1"}}'),
+    ({"meta": {"id": "error_invalid_key"}}, b'{"meta":{"id":"error_invalid_key"}}'),
+])
+@pytest.mark.asyncio
+async def test_get_meta_sends_passthrough_and_error_bodies_uncached(handler_result, body):
+    """Test that upstream bodies and TMDB key errors are sent as is and not cached."""
+    meta_cache = Mock()
+    meta_cache.get.return_value = None
+
+    with patch.dict(meta._ID_HANDLERS, {"tt": AsyncMock(return_value=handler_result)}), \
+         patch.object(meta, "get_meta_cache", return_value=meta_cache), \
+         patch.object(meta, "get_meta_negative_cache", return_value=Mock(get=Mock(return_value=None))), \
+         patch.object(meta, "decode_addon_url", return_value="https://addon"):
+        response = await meta.get_meta(Mock(), Mock(), "YWRkb24=", "language=en-US", "movie", "tt0000001")
+
+    assert response.body == body
+    meta_cache.set.assert_not_called()
@@ -3,8 +3,12 @@
 This module tests the core functionality of detecting embedded Bulgarian
 subtitles in video streams and applying the appropriate visual indicators.
 """
+import asyncio
 import pytest
+from unittest.mock import patch, AsyncMock, Mock, PropertyMock
+from src.translator_app.services import stream_enricher
 from src.translator_app.services.stream_enricher import enrich_streams_with_subtitles
+from src.translator_app.settings import Settings
 
 
 @pytest.mark.asyncio
@@ -199,3 +203,177 @@ async def test_missing_embedded_subtitles_field():
     # Should not crash and should not add flag
     assert len(result) == 1
     assert "🇧🇬" not in result[0]["name"]
+
+
+@pytest.mark.asyncio
+async def test_resolve_with_rd_polls_while_file_selection_runs():
+    """Test that RD resolve selects the file and polls info until links appear."""
+    add_resp = Mock(status_code=201)
+    add_resp.json.return_value = {"id": "T1"}
+    client = Mock()
+    client.post = AsyncMock(return_value=add_resp)
+    poll = AsyncMock(side_effect=[{"status": "queued"}, {"status": "downloaded", "links": ["https://rd/l1"]}])
+
+    with patch.object(Settings, "effective_rd_token", new_callable=PropertyMock, return_value="tok"), \
+         patch.object(stream_enricher, "get_http_client", return_value=client), \
+         patch.object(stream_enricher, "_rd_select_file", new=AsyncMock()) as mock_select, \
+         patch.object(stream_enricher, "_rd_poll_info", new=poll), \
+         patch.object(stream_enricher, "_rd_unrestrict", new=AsyncMock(return_value="https://dl/1")), \
+         patch.object(stream_enricher.asyncio, "sleep", new=AsyncMock()) as mock_sleep:
+        result = await stream_enricher._resolve_with_rd("abc", 2)
+
+    assert result == "https://dl/1"
+    mock_select.assert_awaited_once_with(client, "T1", 2)
+    assert poll.await_count == 2
+    mock_sleep.assert_awaited_once_with(stream_enricher.settings.rd_poll_initial_interval)
+
+
+@pytest.mark.asyncio
+async def test_resolve_with_rd_cancels_file_selection_on_early_return():
+    """Test that a dead torrent does not leave the file selection task running."""
+    add_resp = Mock(status_code=201)
+    add_resp.json.return_value = {"id": "T1"}
+    client = Mock()
+    client.post = AsyncMock(return_value=add_resp)
+    selection_cancelled = asyncio.Event()
+
+    async def hanging_select(client, torrent_id, file_idx):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            selection_cancelled.set()
+            raise
+
+    async def dead_poll(client, torrent_id):
+        await asyncio.sleep(0)
+        return {"status": "dead"}
+
+    with patch.object(Settings, "effective_rd_token", new_callable=PropertyMock, return_value="tok"), \
+         patch.object(stream_enricher, "get_http_client", return_value=client), \
+         patch.object(stream_enricher, "_rd_select_file", new=hanging_select), \
+         patch.object(stream_enricher, "_rd_poll_info", new=dead_poll):
+        result = await stream_enricher._resolve_with_rd("abc", 2)
+
+    assert result is None
+    assert selection_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_resolve_with_rd_skips_rd_during_cooldown():
+    """Test that a failed addMagnet short-circuits the following resolves."""
+    add_resp = Mock(status_code=503)
+    client = Mock()
+    client.post = AsyncMock(return_value=add_resp)
+
+    with patch.object(Settings, "effective_rd_token", new_callable=PropertyMock, return_value="tok"), \
+         patch.object(stream_enricher, "get_http_client", return_value=client), \
+         patch.dict(stream_enricher._rd_state, {"cooldown": 0.0}):
+        assert await stream_enricher._resolve_with_rd("abc", None) is None
+        assert await stream_enricher._resolve_with_rd("def", None) is None
+
+    client.post.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_resolve_with_rd_keeps_rd_enabled_after_a_rejected_magnet():
+    """Test that a 4xx for one magnet fails only that stream, not later resolves."""
+    add_resp = Mock(status_code=400)
+    client = Mock()
+    client.post = AsyncMock(return_value=add_resp)
+
+    with patch.object(Settings, "effective_rd_token", new_callable=PropertyMock, return_value="tok"), \
+         patch.object(stream_enricher, "get_http_client", return_value=client), \
+         patch.dict(stream_enricher._rd_state, {"cooldown": 0.0}):
+        assert await stream_enricher._resolve_with_rd("abc", None) is None
+        assert await stream_enricher._resolve_with_rd("def", None) is None
+        assert stream_enricher._rd_state["cooldown"] == 0.0
+
+    assert client.post.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_probe_budget_uses_cached_results_and_survives_failures():
+    """Test that a failing probe is tolerated and streams past the budget use cached probes."""
+    streams = [
+        {"name": "A 2160p", "url": "http://example.com/a.mkv"},
+        {"name": "B 1080p", "url": "http://example.com/b.mkv"},
+        {"name": "C 720p", "url": "http://example.com/c.mkv"},
+    ]
+    cached = {"langs": ["bul"], "tracks": [{"lang": "bul", "title": ""}]}
+
+    with patch.object(stream_enricher.settings, "stream_subs_max_streams", 2), \
+         patch.object(stream_enricher.stream_probe, "probe", new=AsyncMock(side_effect=[RuntimeError("boom"), None])) as mock_probe, \
+         patch.object(stream_enricher.stream_probe, "get_cached", return_value=cached) as mock_cached:
+        result = await enrich_streams_with_subtitles(streams, enrich_level=2)
+
+    assert mock_probe.await_count == 2
+    mock_cached.assert_called_once_with("http://example.com/c.mkv")
+    assert result[0]["url"] == "http://example.com/c.mkv"
+    assert result[0].get("subs_bg") is True
+
+
+@pytest.mark.asyncio
+async def test_magnet_resolution_respects_rd_concurrency():
+    """Test that magnets resolve concurrently but never beyond the RD semaphore."""
+    streams = [{"name": f"S{i}", "infoHash": f"h{i}"} for i in range(4)]
+    state = {"active": 0, "peak": 0}
+
+    async def fake_resolve(info_hash, file_idx):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0)
+        state["active"] -= 1
+        return f"https://dl/{info_hash}"
+
+    with patch.object(stream_enricher, "_rd_sem", asyncio.Semaphore(2)), \
+         patch.object(stream_enricher, "_resolve_with_rd", new=fake_resolve), \
+         patch.object(stream_enricher.stream_probe, "probe", new=AsyncMock(return_value=None)):
+        result = await enrich_streams_with_subtitles(streams, enrich_level=2)
+
+    assert state["peak"] == 2
+    assert all(s["behaviorHints"]["rdResolved"] for s in result)
+
+
+@pytest.mark.asyncio
+async def test_fully_classified_streams_are_not_probed():
+    """Test that streams already flagged for BG subs and audio leave the probe budget to others."""
+    streams = [
+        {
+            "name": "BG Audio 2160p",
+            "url": "http://example.com/flagged.mkv",
+            "embeddedSubtitles": [{"lang": "bul", "title": ""}],
+        },
+        {"name": "Plain 720p", "url": "http://example.com/plain.mkv"},
+    ]
+
+    with patch.object(stream_enricher.settings, "stream_subs_max_streams", 1), \
+         patch.object(stream_enricher.stream_probe, "probe", new=AsyncMock(return_value=None)) as mock_probe, \
+         patch.object(stream_enricher.stream_probe, "get_cached", return_value=None):
+        await enrich_streams_with_subtitles(streams, enrich_level=2)
+
+    mock_probe.assert_awaited_once_with("http://example.com/plain.mkv")
+
+
+@pytest.mark.asyncio
+async def test_prioritization_keeps_upstream_order_within_a_rank():
+    """Test that the priority sort is stable for streams of equal rank."""
+    streams = [
+        {"name": "Plain A"},
+        {"name": "Sub A", "embeddedSubtitles": [{"lang": "bg"}]},
+        {"name": "Plain B"},
+        {"name": "Sub B", "embeddedSubtitles": [{"lang": "bul"}]},
+        {"name": "Plain C"},
+    ]
+
+    result = await enrich_streams_with_subtitles(streams, enrich_level=1)
+
+    names = [s["name"].replace("🇧🇬", "").strip() for s in result]
+    assert names == ["Sub A", "Sub B", "Plain A", "Plain B", "Plain C"]
+
+
+def test_subtitle_langs_has_bg_accepts_strings_and_lists():
+    """Test BG detection over comma-separated and list subtitle languages."""
+    assert stream_enricher._subtitle_langs_has_bg("en, fr,BG,es")
+    assert stream_enricher._subtitle_langs_has_bg(["eng", "Bulgarian"])
+    assert not stream_enricher._subtitle_langs_has_bg("en,,fr")
+    assert not stream_enricher._subtitle_langs_has_bg(None)
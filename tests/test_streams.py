@@ -0,0 +1,25 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from src.translator_app.routers import streams
+
+
+@pytest.mark.asyncio
+async def test_fetch_upstream_streams_coalesces_on_url_and_sorted_query():
+    """Test that upstream stream fetches are single-flighted per URL and query, whatever the param order."""
+    calls = []
+
+    async def spy(registry, key, factory):
+        calls.append((registry, key))
+        return await factory()
+
+    client = Mock()
+    client.get = AsyncMock(return_value=Mock(status_code=200))
+    query = {"b": "2", "a": "1"}
+
+    with patch.object(streams, "coalesce", spy), patch.object(streams, "get_http_client", return_value=client):
+        await streams._fetch_upstream_streams("https://addon/stream/movie/tt0000001.json", query)
+
+    assert calls == [(streams._upstream_inflight, ("https://addon/stream/movie/tt0000001.json", (("a", "1"), ("b", "2"))))]
+    client.get.assert_awaited_once_with("https://addon/stream/movie/tt0000001.json", params=query)
@@ -0,0 +1,33 @@
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+
+from src.translator_app.routers import subtitles
+
+
+@pytest.mark.asyncio
+async def test_proxy_drops_hop_by_hop_headers_regardless_of_case():
+    """Test that upstream framing headers are not forwarded, whatever their casing."""
+    def handler(request):
+        return httpx.Response(
+            200,
+            headers=[("Transfer-Encoding", "chunked"), ("Connection", "keep-alive"), ("X-Upstream", "1")],
+            content=b"subs",
+        )
+
+    client = httpx.AsyncClient(base_url="https://subs.example", transport=httpx.MockTransport(handler))
+    request = Mock()
+    request.method = "GET"
+    request.headers.raw = [(b"host", b"local"), (b"accept", b"*/*")]
+    request.body = AsyncMock(return_value=b"")
+    request.query_params = {}
+
+    with patch.object(subtitles, "get_http_client", return_value=client):
+        response = await subtitles.proxy_subtitles(request, "search")
+
+    names = [k.lower() for k, _ in response.raw_headers]
+    assert b"transfer-encoding" not in names
+    assert b"connection" not in names
+    assert b"x-upstream" in names
+    await client.aclose()
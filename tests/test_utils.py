@@ -33,3 +33,29 @@ def test_utils_parse_user_settings():
     
     # Empty settings
     assert parse_user_settings("") == {}
+
+def test_utils_decode_addon_url():
+    """Test combined addon URL decoding and normalization"""
+    import base64
+    from unittest.mock import patch
+    from src.translator_app.utils import decode_addon_url
+
+    encoded = base64.b64encode(b"https://addon.example.com/manifest.json").decode()
+    with patch("socket.gethostbyname", return_value="93.184.216.34"):
+        assert decode_addon_url(encoded) == "https://addon.example.com"
+
+def test_utils_addon_url_host_check_is_not_cached_forever():
+    """Test that a host re-resolving to a private address is rejected once its check expires"""
+    import base64
+    from unittest.mock import patch
+    from fastapi import HTTPException
+    from src.translator_app import utils
+
+    encoded = base64.b64encode(b"https://rebind.example.com").decode()
+    with patch("socket.gethostbyname", return_value="93.184.216.34"):
+        assert utils.decode_addon_url(encoded) == "https://rebind.example.com"
+
+    utils._resolve_public_host.cache.clear()
+    with patch("socket.gethostbyname", return_value="10.0.0.5"):
+        with pytest.raises(HTTPException):
+            utils.decode_addon_url(encoded)